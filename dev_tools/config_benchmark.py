@@ -0,0 +1,174 @@
+"""
+Load/save latency of a config with full item containers.
+
+    python -m dev_tools.config_benchmark --items 1500
+
+Compares the legacy stdlib json with inline base64 blobs against orjson,
+and against item containers moved to side stores with each available serializer.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from module.config import serializer as config_serializer
+from module.config.serializer import SERIALIZERS, JsonSerializer
+from module.config.stored import side_store
+from module.config.utils import _recursively_convert
+from module.db.models.neoitem import NeoItem
+
+TEMPLATE = './config/template.json'
+CONTAINERS = [
+    'InventoryTool.PlayerStorage.InventoryData',
+    'InventoryTool.PlayerStorage.StockData',
+    'SafetyDepositBox.SafetyDepositBox.DepositData',
+]
+
+
+def random_item(index):
+    return NeoItem(
+        name=f'Benchmark Item {index}',
+        id=str(100000 + index),
+        index=index,
+        market_price=random.randint(1, 1_000_000),
+        restock_price=random.randint(1, 100_000),
+        price_timestamp=time.time(),
+        rarity=random.randint(1, 101),
+        image=f'https://images.neopets.com/items/bench_{index}.gif',
+        description='A very ordinary item used to benchmark config IO. ' * 3,
+        item_type='Food',
+        quantity=random.randint(1, 5),
+    )
+
+
+def build_config(items):
+    with open(TEMPLATE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    for path in CONTAINERS:
+        task, group, arg = path.split('.')
+        data[task][group][arg] = {
+            'value': [random_item(i) for i in range(items)],
+            'time': '2020-01-01 00:00:00',
+        }
+    return data
+
+
+class Case:
+    name = ''
+    slug = ''
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.file = os.path.join(folder, f'{self.slug}.json')
+
+    def size(self):
+        total = os.path.getsize(self.file)
+        for root, _, files in os.walk(os.path.join(self.folder, self.slug)):
+            total += sum(os.path.getsize(os.path.join(root, file)) for file in files)
+        return total
+
+    def save(self, data):
+        raise NotImplementedError
+
+    def load(self):
+        raise NotImplementedError
+
+
+class LegacyJson(Case):
+    name = 'stdlib json, inline base64'
+    slug = 'legacy'
+
+    def save(self, data):
+        with open(self.file, 'w', encoding='utf-8') as f:
+            json.dump(_recursively_convert(data, encode=True), f, indent=2, ensure_ascii=False, default=str)
+
+    def load(self):
+        with open(self.file, 'r', encoding='utf-8') as f:
+            return _recursively_convert(json.load(f), encode=False)
+
+
+class OrjsonInline(Case):
+    name = 'orjson, inline base64'
+    slug = 'orjson'
+
+    def save(self, data):
+        with open(self.file, 'wb') as f:
+            f.write(JsonSerializer.dumps(_recursively_convert(data, encode=True)))
+
+    def load(self):
+        with open(self.file, 'rb') as f:
+            return _recursively_convert(JsonSerializer.loads(f.read()), encode=False)
+
+
+class SideStore(Case):
+    serializer = ''
+
+    def save(self, data):
+        config_serializer.STORED_SERIALIZER = self.serializer
+        data = dict(data)
+        for path in CONTAINERS:
+            task, group, arg = path.split('.')
+            node = dict(data[task][group][arg])
+            node['value'] = side_store.dump(self.slug, path, node['value'])
+            data[task] = {**data[task], group: {**data[task][group], arg: node}}
+        with open(self.file, 'wb') as f:
+            f.write(JsonSerializer.dumps(_recursively_convert(data, encode=True)))
+
+    def load(self):
+        # Measure a cold process, not the in-memory cache of side_store
+        side_store._Loaded.clear()
+        with open(self.file, 'rb') as f:
+            data = _recursively_convert(JsonSerializer.loads(f.read()), encode=False)
+        for path in CONTAINERS:
+            task, group, arg = path.split('.')
+            node = data[task][group][arg]
+            node['value'] = side_store.resolve(node['value'])
+        return data
+
+
+def side_store_case(serializer):
+    return type(f'SideStore_{serializer}', (SideStore,), {
+        'name': f'orjson + {serializer} side store',
+        'slug': f'side_store_{serializer}',
+        'serializer': serializer,
+    })
+
+
+def benchmark(items, rounds):
+    random.seed(0)
+    data = build_config(items)
+    folder = tempfile.mkdtemp(prefix='nch_config_benchmark_')
+    side_store_dir, stored_serializer = side_store.SIDE_STORE_DIR, config_serializer.STORED_SERIALIZER
+    side_store.SIDE_STORE_DIR = folder
+    cases = [LegacyJson, OrjsonInline] + [side_store_case(name) for name in SERIALIZERS]
+    print(f'{items} items x {len(CONTAINERS)} containers, {rounds} rounds')
+    print(f'{"case":<36}{"size":>12}{"save (ms)":>12}{"load (ms)":>12}')
+    try:
+        for case in cases:
+            case = case(folder)
+            save, load = [], []
+            for _ in range(rounds):
+                # Side stores skip writing unchanged content, forget it to measure a full write
+                side_store._Loaded.clear()
+                start = time.perf_counter()
+                case.save(data)
+                save.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                case.load()
+                load.append(time.perf_counter() - start)
+            print(f'{case.name:<36}{case.size():>12,}{min(save) * 1000:>12.1f}{min(load) * 1000:>12.1f}')
+    finally:
+        side_store.SIDE_STORE_DIR = side_store_dir
+        config_serializer.STORED_SERIALIZER = stored_serializer
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Config serializer benchmark')
+    parser.add_argument('--items', type=int, default=1500, help='Items in each container')
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+    benchmark(args.items, args.rounds)
@@ -32,7 +32,7 @@ class AzurLaneAutoScript:
     @cached_property
     def config(self) -> AzurLaneConfig:
         try:
-            config = AzurLaneConfig(config_name=self.config_name)
+            config = AzurLaneConfig(config_name=self.config_name, replay_journal=True)
             return config
         except RequestHumanTakeover:
             logger.critical('Request human takeover')
@@ -156,6 +156,8 @@ class AzurLaneAutoScript:
                 content=f"<{self.config_name}> Exception occured",
             )
             exit(1)
+        finally:
+            self.config.flush_stored()
 
     def save_error_log(self):
         """
@@ -183,7 +185,8 @@ class AzurLaneAutoScript:
         future = future + timedelta(seconds=1)
         self.config.start_watching()
         while 1:
-            if datetime.now() > future:
+            remain = (future - datetime.now()).total_seconds()
+            if remain <= 0:
                 return True
             if self.stop_event is not None:
                 if self.stop_event.is_set():
@@ -191,9 +194,8 @@ class AzurLaneAutoScript:
                     logger.info(f"[{self.config_name}] exited. Reason: Update")
                     exit(0)
 
-            time.sleep(5)
-
-            if self.config.should_reload():
+            # Wakes up as soon as the config file changes
+            if self.config.wait_for_reload(timeout=min(remain, 5)):
                 return False
 
     def get_next_task(self):
@@ -1,6 +1,7 @@
 import copy
 import datetime
-import operator
+import heapq
+import os
 import threading
 import time
 
@@ -11,18 +12,46 @@ from module.base.filter import Filter
 from module.config.config_generated import GeneratedConfig
 from module.config.config_manual import ManualConfig, OutputConfig
 from module.config.config_updater import ConfigUpdater
+from module.config.serializer import JsonSerializer
+from module.config.stored import side_store
 from module.config.stored.classes import iter_attribute
 from module.config.stored.stored_generated import StoredGenerated
 from module.config.utils import *
+from module.config.utils import _recursively_convert
 from module.config.watcher import ConfigWatcher
 from module.exception import RequestHumanTakeover, ScriptError
 from module.logger import logger
 import inspect
 
+# Key of journal entries holding a list change instead of the whole stored value
+STORED_DELTA = '__delta__'
+# Paths of stored data, such as `DailyQuest.DailyQuest.FeedTimesLeft`
+STORED_PATHS = frozenset(stored._key for _, stored in iter_attribute(StoredGenerated))
+
+
 class TaskEnd(Exception):
     pass
 
 
+def apply_stored_delta(value, op, args):
+    """
+    Replay a change journaled by `StoredList.add()` or `StoredList.remove()`.
+
+    Args:
+        value (list): Stored value before the change.
+        op (str): 'add' or 'remove'.
+        args (list): Added entries, or values to remove.
+
+    Returns:
+        list: Stored value after the change.
+    """
+    if op == 'add':
+        return list(value) + list(args)
+    if op == 'remove':
+        return [v for v in value if all(v != arg for arg in args)]
+    raise ScriptError(f'Unknown stored data change: {op}')
+
+
 class Function:
     def __init__(self, data):
         self.enable = deep_get(data, keys="Scheduler.Enable", default=False)
@@ -59,9 +88,149 @@ def name_to_function(name):
     return function
 
 
+class TaskQueue:
+    """
+    Enabled tasks of a config, ordered by `SCHEDULER_PRIORITY` once due
+    and by (next_run, priority) while waiting.
+
+    The priority filter is compiled once. Tasks are kept in a heap and
+    only the tasks that changed are pushed again, stale heap entries are
+    skipped when popped.
+    """
+
+    def __init__(self, priority):
+        f = Filter(regex=r"(.*)", attr=["command"])
+        f.load(priority)
+        # Key: lowercase command. Value: position in SCHEDULER_PRIORITY
+        # Tasks not listed are never scheduled.
+        self.rank = {}
+        for index, (command,) in enumerate(f.filter):
+            self.rank.setdefault(command, index)
+        # Key: section name. Value: (enable, command, next_run) as last seen
+        self.seen = {}
+        self.version = {}
+        self.heap = []
+        # Run time reached, key: section name, value: Function
+        self.due = {}
+        # NextRun is not a datetime
+        self.error = {}
+        self.synced = None
+        self._waiting = None
+        # A queue is shared by every config of the same name in the process
+        self.lock = threading.RLock()
+
+    def get_rank(self, func):
+        return self.rank.get(str(func.command).lower())
+
+    def set(self, key, func):
+        """
+        Put task `key` in the queue, replacing its previous state.
+
+        Args:
+            key (str): Section name in config.
+            func (Function):
+        """
+        self.drop(key)
+        self.seen[key] = (func.enable, func.command, func.next_run)
+        if not func.enable:
+            return
+        if not isinstance(func.next_run, datetime):
+            logger.warning(f"Invalid type for task {func.command}, expected datetime, got {type(func.next_run)}")
+            self.error[key] = func
+            return
+        rank = self.get_rank(func)
+        if rank is None:
+            return
+        heapq.heappush(self.heap, (func.next_run, rank, key, self.version[key], func))
+        if len(self.heap) > 4 * len(self.seen) + 16:
+            self.heap = [entry for entry in self.heap if self.version.get(entry[2]) == entry[3]]
+            heapq.heapify(self.heap)
+
+    def drop(self, key):
+        """
+        Remove task `key` from the queue, its heap entries become stale.
+        """
+        self.seen.pop(key, None)
+        self.version[key] = self.version.get(key, 0) + 1
+        self.due.pop(key, None)
+        self.error.pop(key, None)
+        self._waiting = None
+
+    def update(self, key, enable=None, next_run=None):
+        """
+        Apply a change of a single task, such as from `task_delay()`.
+        """
+        with self.lock:
+            state = self.seen.get(key)
+            if state is None:
+                return
+            func = name_to_function(state[1])
+            func.enable = state[0] if enable is None else enable
+            func.next_run = state[2] if next_run is None else next_run
+            self.set(key, func)
+
+    def sync(self, data):
+        """
+        Compare with config data, only tasks whose scheduler changed are updated.
+        """
+        with self.lock:
+            if data is self.synced:
+                return
+            for key, section in data.items():
+                scheduler = section.get("Scheduler") if isinstance(section, dict) else None
+                if not isinstance(scheduler, dict):
+                    continue
+                state = (
+                    scheduler.get("Enable", False),
+                    scheduler.get("Command", "Unknown"),
+                    scheduler.get("NextRun", DEFAULT_TIME),
+                )
+                if self.seen.get(key) != state:
+                    self.set(key, Function(section))
+            for key in [key for key in self.seen if key not in data]:
+                self.drop(key)
+            self.synced = data
+
+    def split(self, now):
+        """
+        Args:
+            now (datetime): Tasks to run before this are pending.
+
+        Returns:
+            list[Function]: Pending tasks, in priority order.
+            list[Function]: Waiting tasks, in run time order.
+        """
+        with self.lock:
+            heap = self.heap
+            while heap and heap[0][0] < now:
+                _, _, key, version, func = heapq.heappop(heap)
+                if self.version.get(key) == version:
+                    self.due[key] = func
+                    self._waiting = None
+            # `now` moves back when task hoarding is turned off
+            for key in [key for key, func in self.due.items() if func.next_run >= now]:
+                func = self.due.pop(key)
+                heapq.heappush(heap, (func.next_run, self.get_rank(func), key, self.version[key], func))
+                self._waiting = None
+
+            pending = sorted(self.due.values(), key=self.get_rank)
+            if self.error:
+                pending = list(self.error.values()) + pending
+            if self._waiting is None:
+                self._waiting = [entry[4] for entry in sorted(heap) if self.version.get(entry[2]) == entry[3]]
+            return pending, list(self._waiting)
+
+
+# Key: config name. Value: TaskQueue shared by every config of that name in the process
+TaskQueues: dict[str, TaskQueue] = {}
+_TaskQueuesLock = threading.Lock()
+
+
 class AzurLaneConfig(ConfigUpdater, ManualConfig, GeneratedConfig, ConfigWatcher):
     stop_event: threading.Event = None
     bound = {}
+    # Seconds stored data mutations are held in memory before the config file is rewritten
+    STORED_FLUSH_INTERVAL = 10
 
     # Class property
     is_hoarding_task = True
@@ -75,7 +244,15 @@ class AzurLaneConfig(ConfigUpdater, ManualConfig, GeneratedConfig, ConfigWatcher
         else:
             super().__setattr__(key, value)
 
-    def __init__(self, config_name, task=None):
+    def __init__(self, config_name, task=None, replay_journal=False):
+        """
+        Args:
+            config_name (str): ./config/<config_name>.json
+            task (str): Bind a specific task for debug purpose.
+            replay_journal (bool): Restore stored data journaled by a process that
+                exited before flushing. Only the scheduler does, other readers such as
+                the web UI would otherwise hold the replayed changes unsaved.
+        """
         logger.attr("Lang", self.LANG)
         # This will read ./config/<config_name>.json
         self.config_name = config_name
@@ -88,6 +265,9 @@ class AzurLaneConfig(ConfigUpdater, ManualConfig, GeneratedConfig, ConfigWatcher
         self.bound = {}
         # If write after every variable modification.
         self.auto_update = True
+        # Last time `modified` was written to file, stored data mutations are flushed
+        # at most once per STORED_FLUSH_INTERVAL and journaled until then.
+        self.last_saved = time.time()
         # Force override variables
         # Key: Argument name in GeneratedConfig. Value: Modified value.
         self.overridden = {}
@@ -96,6 +276,12 @@ class AzurLaneConfig(ConfigUpdater, ManualConfig, GeneratedConfig, ConfigWatcher
         # waiting_task: Run time haven't been reached, wait needed.
         self.pending_task = []
         self.waiting_task = []
+        # Held by `update()`, a config may be shared with background task threads
+        self.lock = threading.RLock()
+        # Compare-and-swap values of the running `transaction()`. Key: path. Value: value expected in file.
+        self.tx_expected = {}
+        # `modified` when the outermost multi_set() or transaction() began, restored on abort
+        self.tx_snapshot = {}
         # Task to run and bind.
         # Task means the name of the function to run in AzurLaneAutoScript class.
         self.task: Function
@@ -107,6 +293,8 @@ class AzurLaneConfig(ConfigUpdater, ManualConfig, GeneratedConfig, ConfigWatcher
             logger.info("Using template config, which is read only")
             self.auto_update = False
             self.task = name_to_function("template")
+        elif replay_journal:
+            self.replay_stored_journal()
         self.init_task(task)
 
     def init_task(self, task=None):
@@ -204,34 +392,24 @@ class AzurLaneConfig(ConfigUpdater, ManualConfig, GeneratedConfig, ConfigWatcher
         """
         Calculate tasks, set pending_task and waiting_task
         """
-        pending = []
-        waiting = []
-        error = []
         now = datetime.now()
         if AzurLaneConfig.is_hoarding_task:
             now -= self.hoarding
-        for func in self.data.values():
-            func = Function(func)
-            if not func.enable:
-                continue
-            if not isinstance(func.next_run, datetime):
-                logger.warning(f"Invalid type for task {func.command}, expected datetime, got {type(func.next_run)}")
-                error.append(func)
-            elif func.next_run < now:
-                pending.append(func)
-            else:
-                waiting.append(func)
-        f = Filter(regex=r"(.*)", attr=["command"])
-        f.load(self.SCHEDULER_PRIORITY)
-        if pending:
-            pending = f.apply(pending)
-        if waiting:
-            waiting = f.apply(waiting)
-            waiting = sorted(waiting, key=operator.attrgetter("next_run"))
-        if error:
-            pending = error + pending
-        self.pending_task = pending
-        self.waiting_task = waiting
+        queue = self.task_queue
+        with queue.lock:
+            queue.sync(self.data)
+            self.pending_task, self.waiting_task = queue.split(now)
+
+    @property
+    def task_queue(self) -> TaskQueue:
+        """
+        Queue of this config name, kept across the configs the scheduler rebuilds after every task.
+        """
+        with _TaskQueuesLock:
+            queue = TaskQueues.get(self.config_name)
+            if queue is None:
+                queue = TaskQueues[self.config_name] = TaskQueue(self.SCHEDULER_PRIORITY)
+            return queue
 
     def get_next(self):
         """
@@ -266,6 +444,7 @@ class AzurLaneConfig(ConfigUpdater, ManualConfig, GeneratedConfig, ConfigWatcher
 
         for path, value in self.modified.items():
             deep_set(self.data, keys=path, value=value)
+        self.dump_side_stores()
 
         logger.info(f"Save config {filepath_config(self.config_name, mod_name)}")
         # Don't use self.modified = {}, that will create a new object.
@@ -275,6 +454,9 @@ class AzurLaneConfig(ConfigUpdater, ManualConfig, GeneratedConfig, ConfigWatcher
         while True:
             try:
                 self.write_file(self.config_name, data=self.data)
+                self.last_saved = time.time()
+                if os.path.exists(filepath_journal(self.config_name)):
+                    os.remove(filepath_journal(self.config_name))
                 break
             except PermissionError as e:
                 depth += 1
@@ -284,11 +466,138 @@ class AzurLaneConfig(ConfigUpdater, ManualConfig, GeneratedConfig, ConfigWatcher
                 logger.warning(f"{e} while saving config, retry after 1 second")
                 time.sleep(1)
 
+    def dump_side_stores(self):
+        """
+        Move loaded values of side-stored containers out of `data`,
+        leaving a reference to their side store file.
+        Untouched containers are still references and cost nothing.
+        """
+        for _, stored in iter_attribute(StoredGenerated):
+            if not stored.SIDE_STORE:
+                continue
+            node = deep_get(self.data, keys=stored._key, default=None)
+            if not isinstance(node, dict) or not isinstance(node.get('value'), (list, LazyBatch)):
+                continue
+            # copy, `node` is also the cached `_stored` of live StoredBase objects
+            node = dict(node)
+            node['value'] = side_store.dump(self.config_name, stored._key, node['value'])
+            deep_set(self.data, keys=stored._key, value=node)
+
     def update(self):
-        self.load()
-        self.config_override()
-        self.bind(self.task)
-        self.save()
+        """
+        Read the config file, apply `modified` and write it back.
+        The file lock is held from read to write, so changes written by other
+        processes or threads in between are not overwritten.
+
+        Returns:
+            bool: False if values expected by `transaction()` were changed by
+                others, changes of the transaction are dropped and nothing is written.
+        """
+        expected, self.tx_expected = self.tx_expected, {}
+        with self.lock, file_lock(filepath_config(self.config_name)):
+            if expected:
+                # compare with the file, before `modified` is applied
+                self.data = self.read_file(self.config_name)
+                conflicts = {
+                    path: deep_get(self.data, keys=path, default=None)
+                    for path, value in expected.items()
+                    if deep_get(self.data, keys=path, default=None) != value
+                }
+                if conflicts:
+                    logger.warning(f"Config transaction aborted, changed by others: {conflicts}")
+                    self.rollback_modified()
+                    self.load()
+                    self.bind(self.task)
+                    return False
+            self.load()
+            self.config_override()
+            self.bind(self.task)
+            self.save()
+        return True
+
+    def rollback_modified(self):
+        """
+        Restore `modified` to when the outermost multi_set() or transaction() began.
+        Stored data changes are kept, they record what already happened in game.
+        """
+        stored = {path: value for path, value in self.modified.items() if path in STORED_PATHS}
+        self.modified.clear()
+        self.modified.update(self.tx_snapshot)
+        self.modified.update(stored)
+
+    def stored_update(self, path, value, delta=None):
+        """
+        Write-behind for `StoredBase` mutations.
+        The change stays in `modified` and is appended to the journal, the config
+        file is only rewritten once `STORED_FLUSH_INTERVAL` has passed since the
+        last save, on `flush_stored()` or on `multi_set()` exit.
+        Changes inside `multi_set()` and `transaction()` are journaled too.
+
+        Args:
+            path (str): Such as `DailyQuest.DailyQuest.FeedTimesLeft`
+            value (dict): Stored data of that path
+            delta (tuple): (op, args) of a list change, journaled instead of the whole
+                value so appending to a large container doesn't encode all of it.
+                See `apply_stored_delta()`.
+        """
+        self.modified[path] = value
+        if self.is_template_config:
+            return
+        if self.auto_update and time.time() - self.last_saved >= self.STORED_FLUSH_INTERVAL:
+            self.update()
+            return
+        if delta is None:
+            entry = {path: value}
+        else:
+            op, args = delta
+            entry = {STORED_DELTA: path, 'op': op, 'args': args, 'time': value['time']}
+        entry = JsonSerializer.dumps(_recursively_convert(entry, encode=True), indent=False)
+        with open(filepath_journal(self.config_name), 'ab') as f:
+            f.write(entry + b'\n')
+
+    def flush_stored(self):
+        """
+        Write pending stored data mutations, called on task boundaries.
+        """
+        if self.modified and not self.is_template_config:
+            self.update()
+
+    def replay_stored_journal(self):
+        """
+        Restore stored data mutations journaled by a process that exited before flushing.
+        They are written to the config file right away, `save()` deletes the journal.
+        """
+        file = filepath_journal(self.config_name)
+        with self.lock, file_lock(filepath_config(self.config_name)):
+            if not os.path.exists(file):
+                return
+            count = 0
+            self.data = self.read_file(self.config_name)
+            with open(file, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = _recursively_convert(JsonSerializer.loads(line), encode=False)
+                    except ValueError:
+                        # torn write of the last entry
+                        continue
+                    if STORED_DELTA in entry:
+                        path = entry[STORED_DELTA]
+                        stored = dict(self.modified.get(path) or deep_get(self.data, keys=path, default={}))
+                        value = side_store.resolve(stored.get('value'), default=[])
+                        value = _recursively_convert(value, encode=False)
+                        stored['value'] = apply_stored_delta(value, entry['op'], entry['args'])
+                        stored['time'] = entry['time']
+                        self.modified[path] = stored
+                        count += 1
+                        continue
+                    for path, value in entry.items():
+                        self.modified[path] = value
+                        count += 1
+            if count:
+                self.save()
+            else:
+                os.remove(file)
+        logger.info(f"Replayed {count} stored data changes from {file}")
 
     def config_override(self):
         now = datetime.now().replace(microsecond=0)
@@ -341,6 +650,25 @@ class AzurLaneConfig(ConfigUpdater, ManualConfig, GeneratedConfig, ConfigWatcher
         """
         return MultiSetWrapper(main=self)
 
+    def transaction(self, expected=None):
+        """
+        Set multiple arguments, possibly of other tasks, and save once atomically.
+        Nothing is written if any value in `expected` no longer matches the file
+        when committing.
+
+        Args:
+            expected (dict): Key: Path such as `{task}.Scheduler.IsRunningBackground`.
+                Value: Value the config file must hold.
+
+        Examples:
+            with self.config.transaction() as tx:
+                self.config.cross_set(f'{task}.Scheduler.IsRunningBackground', False)
+                self.config.task_enable(task)
+            if not tx.committed:
+                ...
+        """
+        return TransactionWrapper(main=self, expected=expected)
+
     def cross_get(self, keys, default=None):
         """
         Get configs from other tasks.
@@ -427,6 +755,7 @@ class AzurLaneConfig(ConfigUpdater, ManualConfig, GeneratedConfig, ConfigWatcher
                 task = self.task.command
             logger.info(f"Delay task `{task}` to {run} ({kv})")
             self.modified[f'{task}.Scheduler.NextRun'] = run
+            self.task_queue.update(task, next_run=run)
             self.update()
         else:
             raise ScriptError(
@@ -458,6 +787,7 @@ class AzurLaneConfig(ConfigUpdater, ManualConfig, GeneratedConfig, ConfigWatcher
                 microsecond=0
             )
             self.modified[f"{task}.Scheduler.Enable"] = True
+            self.task_queue.update(task, enable=True, next_run=self.modified[f"{task}.Scheduler.NextRun"])
             if self.auto_update:
                 self.update()
             return True
@@ -473,6 +803,7 @@ class AzurLaneConfig(ConfigUpdater, ManualConfig, GeneratedConfig, ConfigWatcher
 
         logger.info(f"Task enable: {task}")
         self.modified[f"{task}.Scheduler.Enable"] = True
+        self.task_queue.update(task, enable=True)
         if self.auto_update:
             self.update()
 
@@ -490,6 +821,7 @@ class AzurLaneConfig(ConfigUpdater, ManualConfig, GeneratedConfig, ConfigWatcher
 
         logger.info(f"Task cancel: {task}")
         self.modified[f"{task}.Scheduler.Enable"] = False
+        self.task_queue.update(task, enable=False)
         if self.auto_update:
             self.update()
 
@@ -601,15 +933,43 @@ class MultiSetWrapper:
         """
         self.main = main
         self.in_wrapper = False
+        self.committed = False
 
     def __enter__(self):
         if self.main.auto_update:
             self.main.auto_update = False
+            self.main.tx_snapshot = dict(self.main.modified)
         else:
             self.in_wrapper = True
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         if not self.in_wrapper:
-            self.main.update()
+            self.committed = self.main.update()
+            self.main.auto_update = True
+
+
+class TransactionWrapper(MultiSetWrapper):
+    def __init__(self, main, expected=None):
+        """
+        Args:
+            main (AzurLaneConfig):
+            expected (dict):
+        """
+        super().__init__(main)
+        self.expected = expected or {}
+
+    def __enter__(self):
+        super().__enter__()
+        # Nested transactions are committed with the outermost one
+        self.main.tx_expected.update(self.expected)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None and not self.in_wrapper:
+            # Error inside the transaction, drop its changes
+            self.main.tx_expected = {}
+            self.main.rollback_modified()
             self.main.auto_update = True
+            return
+        super().__exit__(exc_type, exc_val, exc_tb)
@@ -50,6 +50,12 @@ class GeneratedConfig:
     ProfileSettings_JellyNeoExpiry = 168
     ProfileSettings_TaskSoftTerminationTime = 5
 
+    # Group `NetworkFilter`
+    NetworkFilter_Enable = False
+    NetworkFilter_BlockResourceTypes = 'image\nmedia\nfont\n'
+    NetworkFilter_BlockUrls = '*doubleclick.net/*\n*googlesyndication.com/*\n*googletagmanager.com/*\n*googletagservices.com/*\n*google-analytics.com/*\n*amazon-adsystem.com/*\n*adnxs.com/*\n*scorecardresearch.com/*\n*facebook.net/*\n'
+    NetworkFilter_AllowUrls = None
+
     # Group `NeopianBank`
     NeopianBank_DepositThreshold = 1000000
     NeopianBank_MaxDeposit = 500000
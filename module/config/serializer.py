@@ -0,0 +1,73 @@
+from typing import Any
+
+import orjson
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # pragma: no cover
+    msgpack = None  # noqa: N816 – optional, stored data falls back to JSON
+
+
+class JsonSerializer:
+    """
+    orjson, output matches `json.dump(..., indent=2, ensure_ascii=False, default=str)`.
+    """
+    name = 'json'
+    ext = '.json'
+    # Binary blobs of custom objects must be base64 encoded
+    binary = False
+
+    @staticmethod
+    def dumps(data: Any, indent: bool = True) -> bytes:
+        # datetime goes through `default=str` to keep the "YYYY-MM-DD HH:MM:SS" format
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=str, option=option)
+
+    @staticmethod
+    def loads(content: bytes) -> Any:
+        return orjson.loads(content)
+
+
+class MsgpackSerializer:
+    """
+    msgpack, binary blobs of custom objects are stored as is.
+    """
+    name = 'msgpack'
+    ext = '.msgpack'
+    binary = True
+
+    @staticmethod
+    def dumps(data: Any, indent: bool = True) -> bytes:
+        return msgpack.packb(data, default=str, use_bin_type=True)
+
+    @staticmethod
+    def loads(content: bytes) -> Any:
+        return msgpack.unpackb(content, raw=False, strict_map_key=False)
+
+
+SERIALIZERS = {
+    JsonSerializer.name: JsonSerializer,
+}
+if msgpack is not None:
+    SERIALIZERS[MsgpackSerializer.name] = MsgpackSerializer
+
+# Used for stored data side stores, see module.config.stored.side_store
+STORED_SERIALIZER = MsgpackSerializer.name if msgpack is not None else JsonSerializer.name
+
+
+def get_serializer(name: str = None):
+    """
+    Args:
+        name (str): 'json' or 'msgpack', `STORED_SERIALIZER` if None.
+
+    Raises:
+        ImportError: If msgpack is requested but not installed.
+    """
+    name = name or STORED_SERIALIZER
+    if name not in SERIALIZERS:
+        if name == MsgpackSerializer.name:
+            raise ImportError('msgpack is not installed')
+        raise ValueError(f'Unknown serializer: {name}')
+    return SERIALIZERS[name]
@@ -3,6 +3,7 @@ from functools import cached_property as functools_cached_property
 
 from module.base.decorator import cached_property
 from module.config.utils import DEFAULT_TIME, deep_get, _recursively_convert
+from module.config.stored import side_store
 from module.exception import ScriptError
 from typing import TYPE_CHECKING
 from ast import literal_eval
@@ -35,6 +36,8 @@ def iter_attribute(cls):
 class StoredBase:
     time = DEFAULT_TIME
     _config: 'AzurLaneConfig'
+    # Keep `value` in a side store file instead of the config, see module.config.stored.side_store
+    SIDE_STORE = False
 
     def __init__(self, key):
         self._key = key
@@ -67,6 +70,9 @@ class StoredBase:
                     except ValueError:
                         logger.warning(f'{self._name} has invalid attr: {attr}={value}, use default={default}')
                         value = default
+            elif side_store.is_lazy(value):
+                # loaded on first access
+                pass
             else:
                 value = _recursively_convert(value, False)
                 if not isinstance(value, type(default)):
@@ -94,18 +100,30 @@ class StoredBase:
 
     def __setattr__(self, key, value):
         if key in self._attrs:
-            stored = self._stored
-            stored['time'] = now()
-            stored[key] = value
-            self._config.modified[self._key] = stored
-            if self._config.auto_update:
-                self._config.update()
+            self._set(key, value)
         else:
             super().__setattr__(key, value)
 
+    def _set(self, key, value, delta=None):
+        """
+        Args:
+            key (str): Attribute name.
+            value: New value.
+            delta (tuple): (op, args) that turns the old `value` into the new one,
+                journaled instead of the whole value, see `AzurLaneConfig.stored_update()`.
+        """
+        stored = self._stored
+        stored['time'] = now()
+        stored[key] = value
+        self._config.stored_update(self._key, stored, delta=delta)
+
     def __getattribute__(self, item):
         if not item.startswith('_') and item in self._attrs:
-            return self._stored[item]
+            value = self._stored[item]
+            if side_store.is_lazy(value):
+                value = side_store.resolve(value, default=self._attrs[item])
+                self._stored[item] = value
+            return value
         else:
             return super().__getattribute__(item)
 
@@ -396,13 +414,13 @@ class StoredList(StoredBase):
         self.value = val
 
     def add(self, *value):
-        self.value = self.value + list(value)
+        self._set('value', self.value + list(value), delta=('add', list(value)))
 
     def clear(self):
         self.value = []
 
     def remove(self, value):
-        self.value = [v for v in self.value if v != value]
+        self._set('value', [v for v in self.value if v != value], delta=('remove', [value]))
 
     def is_empty(self) -> bool:
         return not self.value
@@ -441,15 +459,115 @@ class StoredList(StoredBase):
     def __bool__(self):
         return bool(self.value)
 
+class StoredIndexedList(StoredList):
+    """
+    StoredList of objects with a `name`.
+    A name -> entries index is kept in sync on set/add/remove/clear,
+    so lookups by name don't scan the list.
+
+    Renaming an entry in place is not seen by the index until the next `set()`,
+    replace the entry instead.
+    """
+    def _reindex(self):
+        value = self.value
+        self._index = {}
+        self._index_add(value)
+        self._indexed = value
+
+    def _index_add(self, entries):
+        for v in entries:
+            self._index.setdefault(v.name, []).append(v)
+
+    def _get_index(self) -> dict[str, list]:
+        if self.__dict__.get('_indexed') is not self.value:
+            self._reindex()
+        return self._index
+
+    def set(self, val: list):
+        super().set(val)
+        self._reindex()
+
+    def _commit(self, value: list, delta=None):
+        """
+        Store `value` whose index was updated in place,
+        reindex if saving reloaded the config and gave back another list.
+        """
+        self._set('value', value, delta=delta)
+        if self.value is value:
+            self._indexed = value
+        else:
+            self._reindex()
+
+    def add(self, *value):
+        self._get_index()
+        self._index_add(value)
+        self._commit(self.value + list(value), delta=('add', list(value)))
+
+    def clear(self):
+        super().clear()
+        self._reindex()
+
+    def remove(self, value):
+        name = value if isinstance(value, str) else getattr(value, 'name', None)
+        if name is None:
+            super().remove(value)
+            self._reindex()
+            return
+        entries = self._get_index().get(name, [])
+        removed = {id(v) for v in entries if v == value}
+        if not removed:
+            return
+        kept = [v for v in entries if id(v) not in removed]
+        if kept:
+            self._index[name] = kept
+        else:
+            self._index.pop(name)
+        self._commit([v for v in self.value if id(v) not in removed], delta=('remove', [value]))
+
+    def get(self, name: str, default=None):
+        entries = self._get_index().get(name)
+        return entries[0] if entries else default
+
+    def entries(self, name: str) -> list:
+        """
+        Returns:
+            list: All entries named `name`, empty if none.
+        """
+        return list(self._get_index().get(name, []))
+
+    def __getitem__(self, item):
+        if isinstance(item, str):
+            entries = self._get_index().get(item)
+            if not entries:
+                raise KeyError(f'Value {item} not found in {self._name}')
+            return entries[0]
+        return super().__getitem__(item)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._reindex()
+
+    def __contains__(self, item):
+        if isinstance(item, str):
+            return item in self._get_index()
+        elif hasattr(item, 'name'):
+            return item.name in self._get_index()
+        else:
+            raise TypeError(f'Unsupported item type: {type(item)} for {self._name}')
+
 class StoredDailyQuestRestockCounter(StoredCounter):
     FIXED_TOTAL = 3
 
 class StoredDailyQuestFeedCounter(StoredCounter):
     FIXED_TOTAL = 1
 
-class StoredItemContainer(StoredList):
+class StoredItemContainer(StoredIndexedList):
+    SIDE_STORE = True
     capacity: int = 50
 
+    def _weight(self, entry) -> int:
+        return max(1, entry.quantity) if entry.category != 'cash' else 0
+
     @property
     def items(self) -> list['NeoItem']:
         return self.value
@@ -457,9 +575,31 @@ class StoredItemContainer(StoredList):
     def normal_items(self) -> list['NeoItem']:
         return [i for i in self.items if i.category != 'cash']
 
+    def _reindex(self):
+        # recounted on the next `size`
+        self._size = None
+        super()._reindex()
+
+    def _index_add(self, entries):
+        super()._index_add(entries)
+        if self.__dict__.get('_size') is not None:
+            self._size += sum(self._weight(v) for v in entries)
+
+    def remove(self, value):
+        super().remove(value)
+        # entries may have been edited in place since counted, recount
+        self._size = None
+
     @property
     def size(self) -> int:
-        return sum(max(1, i.quantity) for i in self.items if i.category != 'cash')
+        """
+        Total weight of entries, kept on add and recounted after set/remove/clear.
+        Like the name index, quantities edited in place are seen after one of those.
+        """
+        self._get_index()
+        if self.__dict__.get('_size') is None:
+            self._size = sum(self._weight(i) for i in self.items)
+        return self._size
 
     def is_full(self, keeps: int = 0) -> bool:
         return self.size + keeps >= self.capacity
@@ -497,7 +637,7 @@ class StoredPendingTrainingFee(StoredList):
     def items(self) -> list['NeoItem']:
         return self.value
 
-class StoredPetsData(StoredList):
+class StoredPetsData(StoredIndexedList):
     @property
     def pets(self) -> list['Neopet']:
         return self.value
@@ -0,0 +1,94 @@
+import hashlib
+import os
+from typing import Any
+
+from module.config.atomicwrites import atomic_write
+from module.config.serializer import get_serializer
+from module.config.utils import LazyBatch, _recursively_convert
+from module.logger import logger
+
+# Large stored values (item containers) live in their own file,
+# the config only keeps a reference to it:
+#   {"__side_store__": "./config/stored/<config>/<key>.<ext>", "hash": <sha1>, "count": <len>, "format": <serializer>}
+# Files are written with `STORED_SERIALIZER`, msgpack keeps item blobs as raw bytes
+# instead of base64 when it is installed.
+SIDE_STORE_TAG = "__side_store__"
+SIDE_STORE_DIR = "./config/stored"
+
+# path -> (hash, file content as parsed by its serializer), so an unchanged file
+# is read once per process. Every load decodes its own value from it, configs
+# never share a list that one of them may edit in place.
+_Loaded: dict[str, tuple[str, Any]] = {}
+
+
+def filepath_side_store(config_name, key, ext=".json"):
+    return os.path.join(SIDE_STORE_DIR, config_name, f"{key}{ext}").replace("\\", "/")
+
+
+def is_reference(node) -> bool:
+    return isinstance(node, dict) and SIDE_STORE_TAG in node
+
+
+def is_lazy(node) -> bool:
+    """
+    Whether `node` is a side store reference or a list of models not decoded yet
+    """
+    return is_reference(node) or isinstance(node, LazyBatch)
+
+
+def dump(config_name, key, value) -> dict:
+    """
+    Write `value` to the side store of `key` unless its content is unchanged.
+
+    Returns:
+        dict: Reference to keep in the config.
+    """
+    serializer = get_serializer()
+    path = filepath_side_store(config_name, key, serializer.ext)
+    tree = _recursively_convert(value, encode=True, binary=serializer.binary)
+    encoded = serializer.dumps(tree, indent=False)
+    digest = hashlib.sha1(encoded).hexdigest()
+    cached = _Loaded.get(path)
+    if cached is None or cached[0] != digest or not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with atomic_write(path, mode="wb", overwrite=True) as f:
+            f.write(encoded)
+    _Loaded[path] = (digest, tree)
+    return {SIDE_STORE_TAG: path, "hash": digest, "count": len(value), "format": serializer.name}
+
+
+def load(ref, default=None) -> Any:
+    """
+    Args:
+        ref (dict): Reference produced by `dump`.
+        default: Returned if the side store file is missing.
+    """
+    path, digest = ref[SIDE_STORE_TAG], ref.get("hash")
+    cached = _Loaded.get(path)
+    if cached is not None and cached[0] == digest:
+        return _recursively_convert(cached[1], encode=False)
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+        serializer = get_serializer(ref.get("format", "json"))
+    except (FileNotFoundError, ImportError) as e:
+        logger.warning(f"Side store {path} not readable ({e}), use default={default}")
+        return default
+    actual = hashlib.sha1(raw).hexdigest()
+    if digest and actual != digest:
+        logger.warning(f"Side store {path} changed since referenced ({digest} -> {actual})")
+    tree = serializer.loads(raw)
+    _Loaded[path] = (actual, tree)
+    return _recursively_convert(tree, encode=False)
+
+
+def resolve(node, default=None) -> Any:
+    """
+    `node` itself, or the value it refers to if it is a side store reference
+    or a `LazyBatch`.
+    """
+    if is_reference(node):
+        return load(node, default=default)
+    if isinstance(node, LazyBatch):
+        return node.load()
+    return node
@@ -5,6 +5,7 @@ from module.config.stored.classes import (
     StoredDailyQuestFeedCounter,
     StoredDailyQuestRestockCounter,
     StoredIgsPurchaseCounter,
+    StoredIndexedList,
     StoredInt,
     StoredItemContainer,
     StoredList,
@@ -1,6 +1,9 @@
+import copy
+import hashlib
 import json
 import os
 import random
+import threading
 import string
 import pytz, tzlocal
 import base64
@@ -17,6 +20,7 @@ from filelock import FileLock
 
 import module.config.server as server_
 from module.config.atomicwrites import atomic_write
+from module.config.serializer import JsonSerializer
 
 LANGUAGES = [
     'en-US',
@@ -61,56 +65,223 @@ def filepath_config(filename, mod_name='alas'):
         return os.path.join('./config', f'{filename}.{mod_name}.json')
 
 
+def filepath_journal(filename):
+    return os.path.join('./config', f'{filename}.stored.journal')
+
+
 def filepath_code():
     return './module/config/config_generated.py'
 
+_FileLocks: Dict[str, FileLock] = {}
+_FileLocksLock = threading.Lock()
+
+
+def file_lock(file: str | os.PathLike) -> FileLock:
+    """
+    Lock of `file` shared within the process.
+    It is re-entrant in the same thread, so a read-modify-write can hold it
+    across `read_file()` and `write_file()`.
+    """
+    path = os.path.abspath(f"{file}.lock")
+    with _FileLocksLock:
+        lock = _FileLocks.get(path)
+        if lock is None:
+            lock = _FileLocks[path] = FileLock(path)
+        return lock
+
+
 # --------------------------------------------------------------------- #
 # Helpers for safe (de)serialisation
 # --------------------------------------------------------------------- #
 _TAG_CLASS = "__class__"
 _TAG_DATA = "__data__"
+# A whole list of objects of the same class encoded by its `serialize_many()`
+_TAG_BATCH = "__batch__"
 
 
-def _encode_obj(obj: Any) -> Any: # searialize custom objects
-    """Convert custom objects to a JSON/YAML friendly structure."""
+def _encode_obj(obj: Any, binary: bool = False) -> Any: # searialize custom objects
+    """
+    Convert custom objects to a JSON/YAML friendly structure,
+    or keep their raw bytes if `binary` for serializers that support it.
+    """
     if hasattr(obj, "serialize") and callable(obj.serialize):
         data = obj.serialize()
         if not isinstance(data, (bytes, bytearray)):
             raise TypeError("serialize() must return bytes")
         return {
             _TAG_CLASS: f"{obj.__class__.__module__}.{obj.__class__.__qualname__}",
-            _TAG_DATA: base64.b64encode(data).decode("ascii"),
+            _TAG_DATA: bytes(data) if binary else base64.b64encode(data).decode("ascii"),
         }
     return obj
 
 
-def _decode_obj(node: Any) -> Any:
-    """Rebuild objects that were encoded by `_encode_obj`."""
+def _encode_batch(objs: list, binary: bool = False) -> Any:
+    """
+    Encode a list of objects of the same class with `serialize_many()` as one node,
+    or return None if the list doesn't qualify.
+    """
+    if not objs:
+        return None
+    cls = objs[0].__class__
+    if not callable(getattr(cls, "serialize_many", None)):
+        return None
+    for obj in objs:
+        if obj.__class__ is not cls:
+            return None
+    data = cls.serialize_many(objs)
+    return {
+        _TAG_CLASS: f"{cls.__module__}.{cls.__qualname__}",
+        _TAG_BATCH: bytes(data) if binary else base64.b64encode(data).decode("ascii"),
+        "count": len(objs),
+    }
+
+
+class LazyBatch:
+    """
+    A list encoded by `_encode_batch`, models are only built on first `load()`.
+    Encoding it again before that writes the original payload back as is.
+    """
+    __slots__ = ("node", "value")
+
+    def __init__(self, node: dict):
+        self.node = node
+        self.value = None
+
+    def load(self) -> list:
+        if self.value is None:
+            self.value = _decode_obj(self.node)
+        return self.value
+
+    def encode(self, binary: bool = False) -> dict:
+        if self.value is not None:
+            return _recursively_convert(self.value, encode=True, binary=binary)
+        data = self.node[_TAG_BATCH]
+        if binary and isinstance(data, str):
+            data = base64.b64decode(data)
+        elif not binary and isinstance(data, (bytes, bytearray)):
+            data = base64.b64encode(data).decode("ascii")
+        return {**self.node, _TAG_BATCH: data}
+
+    def __len__(self) -> int:
+        if self.value is not None:
+            return len(self.value)
+        return self.node.get("count", 0)
+
+    def __repr__(self) -> str:
+        return f"LazyBatch({self.node[_TAG_CLASS]}, count={len(self)})"
+
+
+def _decode_obj(node: Any, lazy: bool = False) -> Any:
+    """
+    Rebuild objects that were encoded by `_encode_obj` or `_encode_batch`,
+    batches are left as `LazyBatch` if `lazy`.
+    """
     if (
         isinstance(node, dict)
         and _TAG_CLASS in node
-        and _TAG_DATA in node
+        and (_TAG_DATA in node or _TAG_BATCH in node)
     ):
+        if lazy and _TAG_BATCH in node:
+            return LazyBatch(node)
         mod_name, _, cls_name = node[_TAG_CLASS].rpartition(".")
         mod = importlib.import_module(mod_name)
         cls = getattr(mod, cls_name)
-        raw = base64.b64decode(node[_TAG_DATA])
-        return cls.deserialize(raw)
+        batch = _TAG_BATCH in node
+        raw = node[_TAG_BATCH] if batch else node[_TAG_DATA]
+        if not isinstance(raw, (bytes, bytearray)):
+            raw = base64.b64decode(raw)
+        return cls.deserialize_many(raw) if batch else cls.deserialize(raw)
     return node
 
 
-def _recursively_convert(obj: Any, encode: bool) -> Any:
-    """Walk nested lists/dicts and (en/de)code."""
+def _recursively_convert(obj: Any, encode: bool, binary: bool = False, lazy: bool = False) -> Any:
+    """
+    Walk nested lists/dicts and (en/de)code.
+    If `lazy`, lists of models are decoded to `LazyBatch`.
+    """
     if isinstance(obj, dict):
-        decoded = _decode_obj(obj)
+        decoded = _decode_obj(obj, lazy)
         if not isinstance(decoded, dict):
             return decoded
         return {
-            k: _recursively_convert(v, encode) for k, v in obj.items()
+            k: _recursively_convert(v, encode, binary, lazy) for k, v in obj.items()
         }
     if isinstance(obj, list):
-        return [_recursively_convert(v, encode) for v in obj]
-    return _encode_obj(obj) if encode else _decode_obj(obj)
+        if encode:
+            batch = _encode_batch(obj, binary)
+            if batch is not None:
+                return batch
+        return [_recursively_convert(v, encode, binary, lazy) for v in obj]
+    if isinstance(obj, LazyBatch):
+        return obj.encode(binary) if encode else obj
+    return _encode_obj(obj, binary) if encode else _decode_obj(obj)
+
+# --------------------------------------------------------------------- #
+# Parsed JSON cache
+#   Key: resolved file path. Value: _ParsedFile
+# A file whose (mtime, size) or content hash did not change is not decoded
+# again, and when it did, only top-level sections that differ are decoded.
+# Callers get a copy of the containers so the cached tree is never mutated.
+# --------------------------------------------------------------------- #
+class _ParsedFile:
+    def __init__(self, stamp, digest, raw, decoded):
+        self.stamp = stamp
+        self.digest = digest
+        self.raw = raw
+        self.decoded = decoded
+
+
+_ParsedFiles: Dict[str, _ParsedFile] = {}
+_ParsedFilesLock = threading.Lock()
+
+
+def _copy_tree(obj: Any) -> Any:
+    """Copy nested dicts/lists, custom objects are deep copied, other leaves are immutable."""
+    if isinstance(obj, dict):
+        return {k: _copy_tree(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_copy_tree(v) for v in obj]
+    if isinstance(obj, LazyBatch):
+        return LazyBatch(obj.node)
+    if hasattr(obj, "serialize"):
+        return copy.deepcopy(obj)
+    return obj
+
+
+def _read_json_cached(file: Path) -> JSONLike:
+    key = str(file.resolve())
+    st = file.stat()
+    with _ParsedFilesLock:
+        cached = _ParsedFiles.get(key)
+    if cached is not None and cached.stamp == (st.st_mtime_ns, st.st_size):
+        return cached.decoded
+
+    # Never wait for the file lock while holding _ParsedFilesLock, the holder of
+    # the file lock may be reading other files in a transaction.
+    with file_lock(file):
+        print(f"read: {file}")
+        st = file.stat()
+        content = file.read_bytes()
+    stamp = (st.st_mtime_ns, st.st_size)
+    digest = hashlib.sha1(content).hexdigest()
+    if cached is not None and cached.digest == digest:
+        cached.stamp = stamp
+        return cached.decoded
+
+    raw = JsonSerializer.loads(content)
+    if isinstance(raw, dict):
+        decoded = {}
+        for section, node in raw.items():
+            if cached is not None and isinstance(cached.raw, dict) and cached.raw.get(section) == node:
+                decoded[section] = cached.decoded[section]
+            else:
+                decoded[section] = _recursively_convert(node, encode=False, lazy=True)
+    else:
+        decoded = _recursively_convert(raw, encode=False, lazy=True)
+    with _ParsedFilesLock:
+        _ParsedFiles[key] = _ParsedFile(stamp, digest, raw, decoded)
+    return decoded
+
 
 def read_file(file: str | os.PathLike) -> JSONLike:
     """
@@ -124,16 +295,16 @@ def read_file(file: str | os.PathLike) -> JSONLike:
         return {}
 
     _, ext = os.path.splitext(file)
-    lock = FileLock(f"{file}.lock")
+    if ext == ".json":
+        return _copy_tree(_read_json_cached(file))
+
+    lock = file_lock(file)
     with lock:
         print(f"read: {file}")
         if ext == ".yaml":
             with open(file, "r", encoding="utf-8") as f:
                 content = list(yaml.safe_load_all(f))
                 data: JSONLike = content[0] if len(content) == 1 else content
-        elif ext == ".json":
-            with open(file, "r", encoding="utf-8") as f:
-                data = json.load(f)
         else:
             print(f"Unsupported config file extension: {ext}")
             return {}
@@ -152,7 +323,7 @@ def write_file(file: str | os.PathLike, data: JSONLike) -> None:
     data_to_write = _recursively_convert(data, encode=True)  # encode custom objs
 
     _, ext = os.path.splitext(file)
-    lock = FileLock(f"{file}.lock")
+    lock = file_lock(file)
     with lock:
         print(f"write: {file}")
         if ext == ".yaml":
@@ -168,11 +339,8 @@ def write_file(file: str | os.PathLike, data: JSONLike) -> None:
                         allow_unicode=True, sort_keys=False
                     )
         elif ext == ".json":
-            with atomic_write(file, overwrite=True, encoding="utf-8") as f:
-                json.dump(
-                    data_to_write, f, indent=2, ensure_ascii=False,
-                    sort_keys=False, default=str
-                )
+            with atomic_write(file, mode="wb", overwrite=True) as f:
+                f.write(JsonSerializer.dumps(data_to_write))
         else:
             print(f"Unsupported config file extension: {ext}")
 
@@ -1,33 +1,222 @@
+import ctypes
+import ctypes.util
 import os
+import struct
+import sys
+import threading
+import time
+import weakref
 from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
 
 from module.config.utils import filepath_config, DEFAULT_TIME
 from module.logger import logger
 
+# Seconds between directory scans when filesystem notifications are not available
+POLL_INTERVAL = 5
+
+# inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_CLOEXEC = 0o2000000
+IN_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+IN_EVENT = struct.Struct('iIII')
+
+
+class FolderWatcher:
+    """
+    Calls subscribers when files in a folder are written, replaced or removed.
+
+    Uses inotify on Linux, a single background thread scanning the folder
+    every `POLL_INTERVAL` seconds elsewhere. Nothing runs until the first
+    subscription, and the scan only runs while there are subscribers.
+    """
+
+    def __init__(self, folder: str = './config'):
+        self.folder = folder
+        self.subscribers: Dict[int, Tuple[Optional[str], Callable[[str], None]]] = {}
+        self.backend = ''
+        self._lock = threading.Lock()
+        self._has_subscriber = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._next_id = 0
+
+    def subscribe(self, callback: Callable[[str], None], name: str = None) -> Callable[[], None]:
+        """
+        Args:
+            callback: Called with the changed file name, from the watcher thread.
+            name (str): File name to watch, such as "nechouli.json". All files if None.
+
+        Returns:
+            callable: Call to unsubscribe.
+        """
+        with self._lock:
+            self._next_id += 1
+            sub_id = self._next_id
+            self.subscribers[sub_id] = (name, callback)
+            self._has_subscriber.set()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='ConfigWatcher', daemon=True)
+                self._thread.start()
+
+        def unsubscribe():
+            with self._lock:
+                self.subscribers.pop(sub_id, None)
+                if not self.subscribers:
+                    self._has_subscriber.clear()
+
+        return unsubscribe
+
+    def notify(self, name: str = None) -> None:
+        """
+        Args:
+            name (str): Changed file name, every subscriber is called if None.
+        """
+        with self._lock:
+            subscribers = list(self.subscribers.values())
+        for watch, callback in subscribers:
+            if name is not None and watch is not None and watch != name:
+                continue
+            try:
+                callback(name if name is not None else watch)
+            except Exception as e:  # noqa: BLE001
+                logger.warning(f'Config watcher callback failed: {e}')
+
+    def _run(self) -> None:
+        os.makedirs(self.folder, exist_ok=True)
+        if sys.platform.startswith('linux'):
+            try:
+                self._run_inotify()
+                return
+            except OSError as e:
+                logger.warning(f'inotify unavailable ({e}), poll config folder every {POLL_INTERVAL}s')
+        self._run_polling()
+
+    def _run_inotify(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fd = libc.inotify_init1(IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        if libc.inotify_add_watch(fd, os.fsencode(self.folder), IN_WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, f'inotify_add_watch failed on {self.folder}')
+        self.backend = 'inotify'
+        logger.info(f'Watching {self.folder} with inotify')
+        try:
+            while 1:
+                buffer = os.read(fd, 0x10000)
+                changed: List[str] = []
+                offset = 0
+                while offset < len(buffer):
+                    _, mask, _, length = IN_EVENT.unpack_from(buffer, offset)
+                    offset += IN_EVENT.size
+                    name = buffer[offset:offset + length].rstrip(b'\0').decode(errors='replace')
+                    offset += length
+                    if mask & IN_Q_OVERFLOW:
+                        changed.append(None)
+                    elif name and name not in changed:
+                        changed.append(name)
+                if None in changed:
+                    self.notify()
+                    continue
+                for name in changed:
+                    self.notify(name)
+        finally:
+            os.close(fd)
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        ret = {}
+        try:
+            with os.scandir(self.folder) as it:
+                for entry in it:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        ret[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            pass
+        return ret
+
+    def _run_polling(self) -> None:
+        self.backend = 'polling'
+        files = self._scan()
+        while 1:
+            self._has_subscriber.wait()
+            time.sleep(POLL_INTERVAL)
+            current = self._scan()
+            for name in current.keys() | files.keys():
+                if current.get(name) != files.get(name):
+                    self.notify(name)
+            files = current
+
+
+Watcher = FolderWatcher()
+
 
 class ConfigWatcher:
     config_name = 'alas'
     start_mtime = DEFAULT_TIME
+    # Set by the watcher thread when the config file is touched
+    config_changed: threading.Event = None
 
     def start_watching(self) -> None:
+        if self.config_changed is None:
+            # The callback must not hold `self`, the scheduler drops its config after every task
+            event = self.config_changed = threading.Event()
+            unsubscribe = Watcher.subscribe(
+                lambda _: event.set(),
+                name=os.path.basename(filepath_config(self.config_name))
+            )
+            self._stop_watching = weakref.finalize(self, unsubscribe)
+        self.config_changed.clear()
         self.start_mtime = self.get_mtime()
 
+    def stop_watching(self) -> None:
+        """
+        Unsubscribe from `Watcher`, also done when the config is garbage collected.
+        """
+        finalizer = self.__dict__.get('_stop_watching')
+        if finalizer is not None:
+            finalizer()
+        self.config_changed = None
+
     def get_mtime(self) -> datetime:
         """
         Last modify time of the file
         """
         timestamp = os.stat(filepath_config(self.config_name)).st_mtime
-        mtime = datetime.fromtimestamp(timestamp).replace(microsecond=0)
-        return mtime
+        return datetime.fromtimestamp(timestamp)
 
     def should_reload(self) -> bool:
         """
         Returns:
             bool: Whether the file has been modified and configs should reload
         """
+        if self.config_changed is not None:
+            if not self.config_changed.is_set():
+                return False
+            # Events of our own writes right before start_watching() may arrive late,
+            # compare mtime to tell them apart.
+            self.config_changed.clear()
         mtime = self.get_mtime()
         if mtime > self.start_mtime:
-            logger.info(f'Config "{self.config_name}" changed at {mtime}')
+            logger.info(f'Config "{self.config_name}" changed at {mtime.replace(microsecond=0)}')
             return True
         else:
             return False
+
+    def wait_for_reload(self, timeout: float) -> bool:
+        """
+        Block until the config file changes or `timeout` seconds passed.
+
+        Returns:
+            bool: Whether configs should reload
+        """
+        if self.config_changed is None:
+            self.start_watching()
+        self.config_changed.wait(timeout)
+        return self.should_reload()
@@ -1,18 +1,22 @@
 from module.logger import logger
 from module.db.models import base_model
+from module.db.item_store import ItemTable, MappedItemStore
+from module.db.price_snapshot import PriceSnapshot
 from module.base import utils
 from module import hardware as hw
 import module.db.models as models
 import struct
 import importlib
+import mmap
 import os
 from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime, timedelta
 from threading import Lock
-from typing import Dict, Optional
+from typing import Dict, MutableMapping, Optional
 from collections import defaultdict
-from time import sleep
+from functools import lru_cache
+from time import sleep, time
 import random
 import orjson
 import threading
@@ -26,14 +30,35 @@ REDIS_JN_MEGA_KEY = "jellyneo_itemdb"
 REDIS_JN_KEY_PREFIX = "jellyneo_itemdb:"
 REDIS_GLOBAL_KEY_PREFIX = "nechouli_globals:"
 REDIS_LOCK_PREFIX = "nechouli_lock:"
+REDIS_JN_CHANNEL = "nechouli_itemdb_updates"
 REDIS_CACHE_URL = os.getenv("REDIS_CACHE", None)
 
-CACHE_FILE = "cache/items.json"
+CACHE_FILE = "cache/items.json"   # legacy JSON snapshot, migrated on load
+CACHE_INDEX_FILE = "cache/items.idx"
+CACHE_LOG_FILE = "cache/items.log"
+CACHE_LOG_COMPACT_SIZE = 4 * 1024 * 1024  # compact once the log outgrows max(this, snapshot)
 JN_CACHE_TTL = 60 * 60 * 24 * 7  # default 7 days
+# TTL multiplier of each rarity band, keyed by the band's upper bound;
+# shop-stocked items (r <= 99) get repriced the most often
+RARITY_TTL_TIERS = ((89, 0.5), (99, 0.75), (180, 2.0), (300, 4.0))
+CATEGORY_TTL_FACTORS = {"food": 0.5}  # lowercase category, applied on top of the rarity tier
+CACHE_REFRESH_AHEAD = 0.8  # share of the TTL after which an item is due for a background refresh
+CACHE_STALE_GRACE = 2.0    # expired items younger than ttl * this are served while being refreshed
+CACHE_SYNC_INTERVAL = 5  # seconds between polls of the log when Redis is absent
 
 DB_LOCK = Lock()
 _GLOBAL_FILE = Path('.nch_globals.json')
+# key -> expires at, for keys of the globals file set with a ttl
+_GLOBAL_EXPIRES = '__expires__'
 ItemDatabase: Dict[str, dict] = {}
+PriceTable: Optional[PriceSnapshot] = None  # built on first use, see `price_snapshot`
+CacheSyncThread: Optional[threading.Thread] = None
+_INSTANCE_ID = f"{os.getpid()}-{random.getrandbits(32):08x}"
+_CacheLogOffset = 0
+_CacheLogInode: Optional[int] = None
+# Log size before which this process doesn't retry a compaction that failed
+# to replace the index, see `_compact_cache_files`
+_CompactRetrySize = 0
 
 RedisConn = None
 RedisFactory = None
@@ -71,38 +96,238 @@ def _redis_get_item(iname: str) -> Optional[dict]:
         if data:
             obj = orjson.loads(data)
             with DB_LOCK:
-                ItemDatabase[iname] = obj
+                _store_items([obj])
             return obj
     except Exception as exc:  # noqa: BLE001
         logger.warning("Redis GET failed (%s): %s", iname, exc)
     return None
 
 
+def _redis_expiry(item: dict) -> int:
+    # keep stale entries around for the grace period so they can still be served
+    ttl = item_ttl(item) * CACHE_STALE_GRACE - (_item_age(item) or 0)
+    return max(60, int(ttl))
+
+
 def _redis_set_item(item: dict, ttl: int = 0) -> None:
     if not _redis_enabled() or not item or "name" not in item:
         return
-    ttl = ttl or JN_CACHE_TTL
+    ttl = ttl or _redis_expiry(item)
     try:
         RedisConn.setex(_redis_key(item["name"].lower()), ttl, orjson.dumps(item))
     except Exception as exc:  # noqa: BLE001
         logger.warning("Redis SETEX failed (%s): %s", item.get("name"), exc)
 
+# ────────────────────────────────────────────────────────────────────────────────
+# Bulk helpers, one round trip per batch
+# ────────────────────────────────────────────────────────────────────────────────
+def _redis_get_many(inames: list) -> Dict[str, dict]:
+    ret = {}
+    if not _redis_enabled() or not inames:
+        return ret
+    try:
+        values = RedisConn.mget([_redis_key(iname) for iname in inames])
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Redis MGET failed (%d keys): %s", len(inames), exc)
+        return ret
+    for iname, data in zip(inames, values):
+        if data:
+            ret[iname] = orjson.loads(data)
+    with DB_LOCK:
+        _store_items(ret.values())
+    return ret
+
+
+def _redis_set_many(items: list, ttl: int = 0) -> None:
+    """
+    SETEX all items and announce them to the other processes
+    on `REDIS_JN_CHANNEL`, in one pipeline.
+    """
+    if not _redis_enabled() or not items:
+        return
+    try:
+        pipe = RedisConn.pipeline(transaction=False)
+        for item in items:
+            pipe.setex(_redis_key(item["name"].lower()), ttl or _redis_expiry(item), orjson.dumps(item))
+        pipe.publish(REDIS_JN_CHANNEL, orjson.dumps({"origin": _INSTANCE_ID, "items": items}))
+        pipe.execute()
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Redis pipelined SETEX failed (%d items): %s", len(items), exc)
+
+def _is_invalid(obj: dict) -> bool:
+    m = (obj.get("market_price") or 0)
+    if type(m) not in (int, float):
+        return True
+    return m <= 0
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Local cache file
+#   CACHE_INDEX_FILE  snapshot, memory-mapped `MappedItemStore` shared by all
+#                     processes on the host
+#   CACHE_LOG_FILE    append-only log, one JSON item per line, replayed over the
+#                     snapshot on load and folded back into it on compaction
+# ────────────────────────────────────────────────────────────────────────────────
+def _read_cache_log(offset: int = 0) -> tuple[Dict[str, dict], int]:
+    """
+    Items appended to the log after byte `offset`.
+
+    Returns:
+        dict: Items keyed by lowercase name.
+        int: Offset right after the last complete line read.
+    """
+    ret = {}
+    if not os.path.exists(CACHE_LOG_FILE):
+        return ret, 0
+    with open(CACHE_LOG_FILE, "rb") as fh:
+        fh.seek(offset)
+        chunk = fh.read()
+    # a line still being written by another process is picked up next time
+    end = chunk.rfind(b"\n") + 1
+    for line in chunk[:end].splitlines():
+        try:
+            obj = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            # torn write of a crashed process
+            continue
+        if obj and obj.get("name") and not _is_invalid(obj):
+            ret[obj["name"].lower()] = obj
+    return ret, offset + end
+
+
+def _read_cache_files() -> Dict[str, dict]:
+    """
+    Snapshot plus every upsert in the log, fully decoded.
+    Falls back to the legacy JSON snapshot if no index file exists yet.
+    """
+    ret = {}
+    if os.path.exists(CACHE_INDEX_FILE):
+        store = MappedItemStore(CACHE_INDEX_FILE)
+        ret = dict(store.items())
+        store.close()
+    elif os.path.exists(CACHE_FILE):
+        with open(CACHE_FILE, "rb") as fh:
+            ret = orjson.loads(fh.read() or b"{}")
+    ret.update(_read_cache_log()[0])
+    return ret
+
+
+def _swap_cache_base(base: Optional[MutableMapping] = None) -> None:
+    """
+    Point `ItemDatabase` at a new base, a fresh mapping of the index file if None.
+    The old store is not closed here, readers still in a lookup keep it alive
+    and it is unmapped once they drop it.
+    """
+    if isinstance(ItemDatabase, ItemTable):
+        ItemDatabase.base = MappedItemStore(CACHE_INDEX_FILE) if base is None else base
+
+
+def _write_cache_snapshot(data: Dict[str, dict]) -> bool:
+    """
+    Returns:
+        bool: If the index file is replaced, it fails on Windows
+            while other processes still map the old one.
+    """
+    try:
+        MappedItemStore.build(CACHE_INDEX_FILE, data)
+    except PermissionError as exc:
+        if not isinstance(ItemDatabase, ItemTable) or not isinstance(ItemDatabase.base, MappedItemStore):
+            logger.warning("Item cache index is in use, keep the log for now: %s", exc)
+            return False
+        # Windows cannot replace a file mapped by this process either,
+        # serve `data` from memory while our own mapping is released.
+        _swap_cache_base(data)
+        try:
+            MappedItemStore.build(CACHE_INDEX_FILE, data)
+        except PermissionError as exc:
+            logger.warning("Item cache index is in use, keep the log for now: %s", exc)
+            _swap_cache_base()
+            return False
+    _swap_cache_base()
+    return True
+
+
+def _compact_cache_files() -> int:
+    """
+    Fold the log into the snapshot, must be called with the cache lock held.
+    If the index cannot be replaced, automatic compaction backs off until
+    the log doubles in size.
+
+    Returns:
+        int: Number of invalid entries dropped.
+    """
+    global _CompactRetrySize  # noqa: PLW0603
+    data = _read_cache_files()
+    purged = 0
+    for key, obj in list(data.items()):
+        if _is_invalid(obj):
+            data.pop(key)
+            purged += 1
+    if _write_cache_snapshot(data):
+        _CompactRetrySize = 0
+        if os.path.exists(CACHE_LOG_FILE):
+            os.remove(CACHE_LOG_FILE)
+    elif os.path.exists(CACHE_LOG_FILE):
+        _CompactRetrySize = 2 * os.path.getsize(CACHE_LOG_FILE)
+    return purged
+
+
+def _append_cache_log(items: list) -> None:
+    Path(CACHE_LOG_FILE).parent.mkdir(parents=True, exist_ok=True)
+    with dlock(lock_file()):
+        with open(CACHE_LOG_FILE, "ab") as fh:
+            fh.write(b"".join(orjson.dumps(item) + b"\n" for item in items))
+        log_size = os.path.getsize(CACHE_LOG_FILE)
+        snapshot_size = os.path.getsize(CACHE_INDEX_FILE) if os.path.exists(CACHE_INDEX_FILE) else 0
+        if log_size > max(CACHE_LOG_COMPACT_SIZE, snapshot_size, _CompactRetrySize):
+            logger.info("Compacting item cache log (%d bytes)", log_size)
+            _compact_cache_files()
+
+
+def compact_item_cache() -> None:
+    """Merge the append-only log into the snapshot file."""
+    with dlock(lock_file()):
+        purged = _compact_cache_files()
+    logger.info("Item cache compacted (%d purged)", purged)
+
+
+def export_item_cache(path: str | os.PathLike) -> None:
+    """
+    Dump the in-memory `ItemDatabase` as one indented JSON file,
+    the format of the legacy `cache/items.json`.
+    """
+    with open(path, "wb") as fh:
+        fh.write(orjson.dumps(dict(ItemDatabase), option=orjson.OPT_INDENT_2))
+    logger.info("Exported %d cached items to %s", len(ItemDatabase), path)
+
+
+def import_item_cache(path: str | os.PathLike) -> int:
+    """
+    Merge items from a JSON file produced by `export_item_cache`
+    (or a legacy `cache/items.json`) into the cache.
+
+    Returns:
+        int: Number of items imported.
+    """
+    with open(path, "rb") as fh:
+        raw = orjson.loads(fh.read())
+    items = [obj for obj in raw.values() if obj.get("name") and not _is_invalid(obj)]
+    save_many(items)
+    logger.info("Imported %d items from %s", len(items), path)
+    return len(items)
+
 # ────────────────────────────────────────────────────────────────────────────────
 # Public API
 # ────────────────────────────────────────────────────────────────────────────────
 def load_item_cache(force_local: bool = False) -> dict:
     """
-    Hydrate the in-memory `ItemDatabase` dict from Redis (preferred) or local JSON,
+    Hydrate the in-memory `ItemDatabase` dict from Redis (preferred), or map
+    the local item index shared by every process on the host,
     deleting any cache entries whose `market_price` is None.
     """
-    global ItemDatabase                     # noqa: PLW0603
+    global ItemDatabase, PriceTable, _CacheLogOffset, _CacheLogInode  # noqa: PLW0603
     purged_redis, purged_file = 0, 0        # metrics
-
-    def _is_invalid(obj: dict) -> bool:
-        m = (obj.get("market_price") or 0)
-        if type(m) not in (int, float):
-            return True
-        return m <= 0
+    PriceTable = None
 
     # ───────────────────────────────── Redis path ──────────────────────────────
     if _redis_enabled() and not force_local:
@@ -145,24 +370,20 @@ def load_item_cache(force_local: bool = False) -> dict:
     while depth > 0:
         depth -= 1
         try:
-            if os.path.exists(CACHE_FILE):
-                logger.info("Loading item cache from %s", CACHE_FILE)
-                with open(CACHE_FILE, "rb") as fh:
-                    raw = orjson.loads(fh.read())
-
-                # strip invalids and rewrite file only if we removed something
-                for key, obj in list(raw.items()):
-                    if _is_invalid(obj):
-                        raw.pop(key)
-                        purged_file += 1
-
+            if not os.path.exists(CACHE_INDEX_FILE) and (
+                os.path.exists(CACHE_FILE) or os.path.exists(CACHE_LOG_FILE)
+            ):
+                logger.info("Building item cache index from %s", CACHE_FILE)
+                with dlock(lock_file()):
+                    purged_file = _compact_cache_files()
                 if purged_file:
-                    with open(CACHE_FILE, "wb") as fh:
-                        fh.write(orjson.dumps(raw))
                     logger.info("Purged %d stale items from cache file", purged_file)
-
-                ItemDatabase = raw
-                break
+            logger.info("Loading item cache from %s", CACHE_INDEX_FILE)
+            # items are decoded on access, only the log is parsed up front
+            delta, _CacheLogOffset = _read_cache_log()
+            _CacheLogInode = os.stat(CACHE_LOG_FILE).st_ino if os.path.exists(CACHE_LOG_FILE) else None
+            ItemDatabase = ItemTable(MappedItemStore(CACHE_INDEX_FILE), delta)
+            break
         except Exception as exc:
             logger.warning("Failed to load cache file (attempts left: %d): %s", depth-1, exc)
             ItemDatabase = {}
@@ -172,34 +393,144 @@ def load_item_cache(force_local: bool = False) -> dict:
 
 def save_cache(item: Optional[dict] = None, *, to_file: bool = False) -> None:
     """
-    Persist a single `item` to Redis/in-mem, or dump the whole DB to disk.
+    Persist a single `item` to Redis/in-mem and the local log,
+    or dump the whole DB to disk.
     """
     if item:
-        _redis_set_item(item)
-        with DB_LOCK: # redis guarantees multiprocess thread safety
-            ItemDatabase[item["name"].lower()] = item
+        save_many([item])
 
-    if to_file or not _redis_enabled():
-        with dlock(lock_file()), open(CACHE_FILE, "wb") as fh:
-            fh.write(orjson.dumps(ItemDatabase, option=orjson.OPT_INDENT_2))
+    if to_file:
+        with dlock(lock_file()):
+            if _redis_enabled():
+                # Redis owns the data, the file is only a backup
+                _write_cache_snapshot(dict(ItemDatabase))
+            else:
+                _compact_cache_files()
 
 
-def is_cached(iname: str) -> bool:
+def save_many(items: list) -> None:
     """
-    True if item exists *and* its market-price timestamp is still within TTL.
+    Persist several items at once, appending them to the local log
+    in a single write when Redis is not configured.
     """
-    iname = iname.lower()
-    obj = ItemDatabase.get(iname) or _redis_get_item(iname)
+    items = [item for item in items if item and item.get("name")]
+    if not items:
+        return
+    _redis_set_many(items)
+    with DB_LOCK: # redis guarantees multiprocess thread safety
+        _store_items(items)
+    if not _redis_enabled():
+        _append_cache_log(items)
+
+
+def _store_items(items) -> None:
+    # must be called with DB_LOCK held
+    items = list(items)
+    for item in items:
+        ItemDatabase[item["name"].lower()] = item
+    if PriceTable is not None:
+        PriceTable.update(items)
+
+
+def price_snapshot() -> PriceSnapshot:
+    """
+    Columnar prices of every cached item, built once and then kept
+    up to date as items are saved or synced from other processes.
+    """
+    global PriceTable  # noqa: PLW0603
+    with DB_LOCK:
+        if PriceTable is None:
+            PriceTable = PriceSnapshot(ItemDatabase.values())
+        return PriceTable
+
+
+def item_ttl(obj: dict) -> float:
+    """
+    Seconds the market price of `obj` stays fresh, `JN_CACHE_TTL` scaled by
+    its rarity band and category. An explicit `ttl` field on the item wins.
+    """
+    if obj.get("ttl"):
+        return obj["ttl"]
+    ttl = JN_CACHE_TTL
+    rarity = obj.get("rarity") or 0
+    for bound, factor in RARITY_TTL_TIERS:
+        if rarity <= bound:
+            ttl *= factor
+            break
+    return ttl * CATEGORY_TTL_FACTORS.get((obj.get("category") or "").lower(), 1.0)
+
+
+def _item_age(obj: Optional[dict]) -> Optional[float]:
+    if not obj or not obj.get("price_timestamp"):
+        return None
+    return datetime.now().timestamp() - obj["price_timestamp"]
+
+
+def _is_nc(obj: dict) -> bool:
+    return obj.get("rarity", 0) > 300  # NC item, never refresh
+
+
+def _is_fresh(obj: Optional[dict]) -> bool:
     if not obj:
         return False
-    elif obj.get("rarity", 0) > 300:  # NC item, never refresh
+    elif _is_nc(obj):
         return True
+    age = _item_age(obj)
+    return age is not None and age <= item_ttl(obj)
 
-    ts = obj.get("price_timestamp")
-    if not ts:
+
+def is_servable(obj: Optional[dict]) -> bool:
+    """
+    True if `obj` is fresh, or expired recently enough to be served
+    while a newer price is fetched in the background.
+    """
+    if _is_fresh(obj):
+        return True
+    age = _item_age(obj)
+    return age is not None and age <= item_ttl(obj) * CACHE_STALE_GRACE
+
+
+def is_due(obj: Optional[dict]) -> bool:
+    """
+    True if `obj` is about to expire (or has) and should be refreshed ahead.
+    """
+    if not obj or _is_nc(obj):
         return False
-    age = (datetime.now() - datetime.fromtimestamp(ts)).total_seconds()
-    return age <= JN_CACHE_TTL
+    age = _item_age(obj)
+    return age is None or age > item_ttl(obj) * CACHE_REFRESH_AHEAD
+
+
+def is_cached(iname: str) -> bool:
+    """
+    True if item exists *and* its market-price timestamp is still within TTL.
+    """
+    iname = iname.lower()
+    obj = ItemDatabase.get(iname) or _redis_get_item(iname)
+    return _is_fresh(obj)
+
+
+def get_many(inames: list) -> Dict[str, dict]:
+    """
+    Cached items by lowercase name, served from memory with a single
+    Redis MGET for the ones not loaded yet. Names not cached are omitted.
+    """
+    ret, missing = {}, []
+    for iname in dict.fromkeys(iname.lower() for iname in inames):
+        obj = ItemDatabase.get(iname)
+        if obj:
+            ret[iname] = obj
+        else:
+            missing.append(iname)
+    ret.update(_redis_get_many(missing))
+    return ret
+
+
+def is_cached_many(inames: list) -> Dict[str, bool]:
+    """
+    `is_cached` for a batch of names, keyed by the names as given.
+    """
+    found = get_many(inames)
+    return {iname: _is_fresh(found.get(iname.lower())) for iname in inames}
 
 
 def update_item_market_price(iname: str, price: int) -> bool:
@@ -216,18 +547,85 @@ def update_item_market_price(iname: str, price: int) -> bool:
     return True
 
 
+# ────────────────────────────────────────────────────────────────────────────────
+# Cross-process coherence
+#   Redis: items saved by any process are published on `REDIS_JN_CHANNEL`
+#   File:  the append-only log is tailed every `CACHE_SYNC_INTERVAL` seconds
+# Either way a daemon thread patches `ItemDatabase` in place.
+# ────────────────────────────────────────────────────────────────────────────────
+def _patch_items(items: list) -> None:
+    with DB_LOCK:
+        _store_items([item for item in items if item and item.get("name")])
+
+
+def _redis_sync_worker() -> None:
+    depth = 0
+    while True:
+        try:
+            pubsub = RedisConn.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(REDIS_JN_CHANNEL)
+            depth = 0
+            for message in pubsub.listen():
+                payload = orjson.loads(message["data"])
+                if payload.get("origin") == _INSTANCE_ID:
+                    continue
+                _patch_items(payload.get("items", []))
+        except Exception as exc:  # noqa: BLE001
+            depth += 1
+            wt = min(60, 2 ** depth)
+            logger.warning("Item cache subscriber failed (%s), reconnect in %d seconds", exc, wt)
+            sleep(wt)
+
+
+def _file_sync_worker() -> None:
+    global _CacheLogOffset, _CacheLogInode  # noqa: PLW0603
+    while True:
+        sleep(CACHE_SYNC_INTERVAL)
+        try:
+            st = os.stat(CACHE_LOG_FILE) if os.path.exists(CACHE_LOG_FILE) else None
+            size, inode = (st.st_size, st.st_ino) if st else (0, None)
+            if size == _CacheLogOffset and inode == _CacheLogInode:
+                continue
+            if size < _CacheLogOffset or inode != _CacheLogInode:
+                # log was compacted into a new index
+                with DB_LOCK:
+                    _swap_cache_base()
+                _CacheLogOffset, _CacheLogInode = 0, inode
+            items, _CacheLogOffset = _read_cache_log(_CacheLogOffset)
+            _patch_items(list(items.values()))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Item cache log sync failed: %s", exc)
+
+
+def start_cache_sync() -> None:
+    """
+    Keep `ItemDatabase` coherent with items saved by other processes,
+    safe to call more than once.
+    """
+    global CacheSyncThread  # noqa: PLW0603
+    if CacheSyncThread is not None and CacheSyncThread.is_alive():
+        return
+    target = _redis_sync_worker if _redis_enabled() else _file_sync_worker
+    CacheSyncThread = threading.Thread(target=target, name="ItemCacheSync", daemon=True)
+    CacheSyncThread.start()
+
+
 def clear_cache() -> None:
     """Delete everything from memory, Redis and local JSON file."""
-    global ItemDatabase  # noqa: PLW0603
+    global ItemDatabase, PriceTable, _CacheLogOffset, _CacheLogInode  # noqa: PLW0603
+    # Readers still holding the old table keep its mapping until they are done
     ItemDatabase = {}
+    PriceTable = None
+    _CacheLogOffset, _CacheLogInode = 0, None
 
     if _redis_enabled():
         logger.info("Wiping Redis keys %s*", REDIS_JN_KEY_PREFIX)
         for key in RedisConn.scan_iter(f"{REDIS_JN_KEY_PREFIX}*"):
             RedisConn.delete(key)
 
-    if os.path.exists(CACHE_FILE):
-        os.remove(CACHE_FILE)
+    for path in (CACHE_FILE, CACHE_INDEX_FILE, CACHE_LOG_FILE):
+        if os.path.exists(path):
+            os.remove(path)
 
     logger.info("Cache cleared")
 
@@ -289,13 +687,19 @@ def dlock(name, timeout=600, open_mode="r+b", exclusive=True):
     with redis_lock(name, timeout):
         yield
 
-def global_set(key: str, value: str) -> None:
+def _global_expired(data: dict, key: str) -> bool:
+    return data.get(_GLOBAL_EXPIRES, {}).get(key, float('inf')) <= time()
+
+def global_set(key: str, value: str, ttl: Optional[int] = None) -> None:
     """
     Write a key-value pair, cross-process safe.
     Redis if available, else file+flock.
+
+    Args:
+        ttl (int): Seconds until the key expires, never if None.
     """
     if _redis_enabled():
-        RedisConn.set(REDIS_GLOBAL_KEY_PREFIX + key, value)
+        RedisConn.set(REDIS_GLOBAL_KEY_PREFIX + key, value, ex=ttl)
         return
 
     _GLOBAL_FILE.touch(exist_ok=True)
@@ -305,6 +709,17 @@ def global_set(key: str, value: str) -> None:
         except orjson.JSONDecodeError:
             data = {}
         data[key] = value
+        expires = data.setdefault(_GLOBAL_EXPIRES, {})
+        if ttl:
+            expires[key] = time() + ttl
+        else:
+            expires.pop(key, None)
+        # drop expired keys while the file is rewritten anyway
+        for k in [k for k in expires if _global_expired(data, k)]:
+            expires.pop(k)
+            data.pop(k, None)
+        if not expires:
+            data.pop(_GLOBAL_EXPIRES)
         fp.seek(0)
         fp.truncate()
         fp.write(orjson.dumps(data))
@@ -326,6 +741,8 @@ def global_get(key: str) -> Optional[str]:
             data = orjson.loads(fp.read()) or {}
         except orjson.JSONDecodeError:
             return None
+    if key == _GLOBAL_EXPIRES or _global_expired(data, key):
+        return None
     return data.get(key)
 
 
@@ -348,7 +765,10 @@ def global_items(prefix: str = "") -> Dict[str, str]:
             data = orjson.loads(fp.read()) or {}
         except orjson.JSONDecodeError:
             return {}
-    return {key: value for key, value in data.items() if key.startswith(prefix)}
+    return {
+        key: value for key, value in data.items()
+        if key.startswith(prefix) and key != _GLOBAL_EXPIRES and not _global_expired(data, key)
+    }
 
 
 def global_delete(key: str) -> None:
@@ -368,11 +788,105 @@ def global_delete(key: str) -> None:
         if key not in data:
             return
         del data[key]
+        expires = data.get(_GLOBAL_EXPIRES, {})
+        expires.pop(key, None)
+        if not expires:
+            data.pop(_GLOBAL_EXPIRES, None)
         fp.seek(0)
         fp.truncate()
         fp.write(orjson.dumps(data))
 
 
+# ────────────────────────────────────────────────────────────────────────────────
+# DataManager model file (little endian)
+#   header   magic, index offset, index length, dead bytes
+#   records  key\0 module\0 class\0 size blob padding, paged like the legacy stream
+#   index    orjson {key: [blob offset, blob size, module, class]}
+# Incremental saves append records and a new index, then repoint the header;
+# the superseded bytes are counted as dead and dropped by the next full rewrite.
+# Files without the magic are read as the legacy headerless record stream.
+# ────────────────────────────────────────────────────────────────────────────────
+MODEL_FILE_MAGIC = b"NCHDM002"
+MODEL_FILE_HEADER = struct.Struct("<8sQQQ")
+MODEL_PAGE_SIZE = 0x100
+
+
+@lru_cache(maxsize=None)
+def _model_class(module_name: str, class_name: str) -> type:
+    try:
+        module = importlib.import_module(module_name)
+        cls = getattr(module, class_name)
+    except (ModuleNotFoundError, AttributeError) as e:
+        raise ImportError(f"Failed to import {module_name}.{class_name}: {e}")
+    if not hasattr(cls, "deserialize"):
+        raise ValueError(f"Class {class_name} does not implement `deserialize()`")
+    return cls
+
+
+def _model_blob(dat) -> tuple[str, str, bytes]:
+    if not issubclass(type(dat), base_model.BaseModel):
+        raise ValueError(f"Only models can be saved")
+    return dat.__module__, type(dat).__name__, dat.serialize()
+
+
+def _record_bytes(key: str, module_name: str, class_name: str, blob: bytes) -> tuple[bytes, bytes]:
+    """
+    Returns:
+        bytes: Entry header, the blob starts right after it.
+        bytes: Blob and page padding.
+    """
+    entry_bytes  = key.encode() + b'\x00'
+    entry_bytes += module_name.encode() + b'\x00'
+    entry_bytes += class_name.encode() + b'\x00'
+    entry_bytes += struct.pack('I', len(blob))
+    paddings = MODEL_PAGE_SIZE - (len(blob) + len(entry_bytes)) % MODEL_PAGE_SIZE
+    return entry_bytes, blob + b'\x00' * paddings
+
+
+class LazyModels(MutableMapping):
+    """
+    Models of a `DataManager` file, each deserialized on first access.
+    """
+
+    def __init__(self, buffer, index: Dict[str, list]):
+        self.buffer = buffer
+        self.index = index
+        self.loaded = {}
+
+    def raw(self, key: str) -> bytes:
+        offset, size, _, _ = self.index[key]
+        return bytes(self.buffer[offset:offset + size])
+
+    def __getitem__(self, key: str):
+        if key in self.loaded:
+            return self.loaded[key]
+        _, _, module_name, class_name = self.index[key]
+        obj = _model_class(module_name, class_name).deserialize(self.raw(key))
+        self.loaded[key] = obj
+        return obj
+
+    def __setitem__(self, key: str, value) -> None:
+        self.loaded[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self.loaded.pop(key, None)
+        self.index.pop(key, None)
+
+    def __contains__(self, key) -> bool:
+        return key in self.loaded or key in self.index
+
+    def __iter__(self):
+        yield from self.loaded
+        for key in self.index:
+            if key not in self.loaded:
+                yield key
+
+    def __len__(self) -> int:
+        return len(self.loaded) + sum(1 for key in self.index if key not in self.loaded)
+
+
 class DataManager:
 
     def __init__(self,
@@ -383,6 +897,10 @@ class DataManager:
         self.backend = backend
         self.save_path = save_path
         self.data = {}
+        self._index: Dict[str, list] = {}   # index of the file on disk
+        self._dead = 0
+        self._fp = None
+        self._mm: Optional[mmap.mmap] = None
 
     def save(self):
         getattr(self, f'save_{self.backend}')()
@@ -390,64 +908,128 @@ class DataManager:
     def load(self):
         getattr(self, f'load_{self.backend}')()
 
-    def save_local(self):
-        page_size = 0x100
-        with open(self.save_path, 'wb') as file:
-            for key, dat in self.data.items():
-                if not issubclass(type(dat), base_model.BaseModel):
-                    raise ValueError(f"Only models can be saved")
-                blob = dat.serialize()
-                blk_size = len(blob)
-                entry_bytes  = key.encode() + b'\x00'
-                entry_bytes += dat.__module__.encode() + b'\x00'
-                entry_bytes += type(dat).__name__.encode() + b'\x00'
-                entry_bytes += struct.pack('I', blk_size)
-                paddings = page_size - (blk_size + len(entry_bytes)) % page_size
-                file.write(entry_bytes + blob + b'\x00' * paddings)
-
-    def load_local(self):
+    def save_local(self, keys=None):
+        """
+        Args:
+            keys (Iterable[str]): Only append the records of these keys
+                (and drop removed ones) instead of rewriting the whole file.
+        """
+        if keys is None or not self._index:
+            return self._rewrite_local()
+        live = 0
+        with open(self.save_path, 'r+b') as file:
+            _, _, index_length, self._dead = MODEL_FILE_HEADER.unpack(
+                file.read(MODEL_FILE_HEADER.size)
+            )
+            self._dead += index_length
+            file.seek(0, os.SEEK_END)
+            offset = file.tell()
+            for key in [k for k in self._index if k not in self.data] + list(keys):
+                old = self._index.pop(key, None)
+                if old:
+                    self._dead += old[1]
+                if key not in self.data:
+                    continue
+                module_name, class_name, blob = _model_blob(self.data[key])
+                entry_bytes, padded = _record_bytes(key, module_name, class_name, blob)
+                file.write(entry_bytes + padded)
+                self._index[key] = [offset + len(entry_bytes), len(blob), module_name, class_name]
+                offset += len(entry_bytes) + len(padded)
+            index_bytes = orjson.dumps(self._index)
+            file.write(index_bytes)
+            file.seek(0)
+            file.write(MODEL_FILE_HEADER.pack(MODEL_FILE_MAGIC, offset, len(index_bytes), self._dead))
+            live = offset - self._dead
+        if self._dead > live:
+            return self._rewrite_local()
+        self._open_local()
+
+    def _rewrite_local(self):
+        tmp = f"{self.save_path}.tmp"
+        index = {}
+        with open(tmp, 'wb') as file:
+            file.write(b'\x00' * MODEL_FILE_HEADER.size)
+            offset = MODEL_FILE_HEADER.size
+            for key in self.data:
+                if isinstance(self.data, LazyModels) and key not in self.data.loaded:
+                    # never touched since load, copy the stored blob as is
+                    _, _, module_name, class_name = self.data.index[key]
+                    blob = self.data.raw(key)
+                else:
+                    module_name, class_name, blob = _model_blob(self.data[key])
+                entry_bytes, padded = _record_bytes(key, module_name, class_name, blob)
+                file.write(entry_bytes + padded)
+                index[key] = [offset + len(entry_bytes), len(blob), module_name, class_name]
+                offset += len(entry_bytes) + len(padded)
+            index_bytes = orjson.dumps(index)
+            file.write(index_bytes)
+            file.seek(0)
+            file.write(MODEL_FILE_HEADER.pack(MODEL_FILE_MAGIC, offset, len(index_bytes), 0))
+        self._close_local()
+        os.replace(tmp, self.save_path)
+        self._open_local()
+
+    def _open_local(self):
+        """
+        Map the saved file and read its index, rebinding lazy models to it.
+        """
+        self._close_local()
+        self._fp = open(self.save_path, 'rb')
+        self._mm = mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ)
+        _, index_offset, index_length, self._dead = MODEL_FILE_HEADER.unpack_from(self._mm, 0)
+        self._index = orjson.loads(self._mm[index_offset:index_offset + index_length])
+        if isinstance(self.data, LazyModels):
+            self.data.buffer = self._mm
+            self.data.index = {k: v for k, v in self._index.items() if k in self.data.index or k in self.data.loaded}
+
+    def _close_local(self):
+        if self._mm is not None:
+            self._mm.close()
+        if self._fp is not None:
+            self._fp.close()
+        self._mm = None
+        self._fp = None
+
+    def load_local(self, lazy=False):
+        """
+        Args:
+            lazy (bool): Deserialize each model on first access
+                instead of all of them up front.
+        """
+        self._close_local()
         self.data = {}
+        self._index = {}
         with open(self.save_path, 'rb') as file:
-            while True:
-                key_bytes = []
-                while True:
-                    byte = file.read(1)
-                    if byte == b'\x00':
-                        if key_bytes:
-                            break
-                        else: # skip padding
-                            continue
-                    if not byte:  # EOF reached
-                        return
-                    key_bytes.append(byte)
-
-                key = b''.join(key_bytes).decode()  # Decode key name
-                # Read module name
-                module_bytes = []
-                while (byte := file.read(1)) != b'\x00':
-                    module_bytes.append(byte)
-                module_name = b''.join(module_bytes).decode()
-                # Read class name
-                class_bytes = []
-                while (byte := file.read(1)) != b'\x00':
-                    class_bytes.append(byte)
-                class_name = b''.join(class_bytes).decode()
-                # Read block size
-                blk_size = struct.unpack('I', file.read(4))[0]
-
-                # Read compressed data
-                logger.info(f"Loading {key} -> {module_name}.{class_name} ({blk_size} bytes)")
-                compressed_data = file.read(blk_size)
-
-                try:
-                    module = importlib.import_module(module_name)
-                    cls = getattr(module, class_name)
-                except (ModuleNotFoundError, AttributeError) as e:
-                    raise ImportError(f"Failed to import {module_name}.{class_name}: {e}")
-
-                # Reconstruct and store object
-                if hasattr(cls, "deserialize"):
-                    obj = cls.deserialize(compressed_data)
-                    self.data[key] = obj
-                else:
-                    raise ValueError(f"Class {class_name} does not implement `deserialize()`")
+            magic = file.read(len(MODEL_FILE_MAGIC))
+        if magic != MODEL_FILE_MAGIC:
+            self._load_legacy()
+            return
+        self._open_local()
+        models = LazyModels(self._mm, dict(self._index))
+        logger.info(f"Loading {len(models)} models from {self.save_path}")
+        self.data = models if lazy else {key: models[key] for key in models}
+
+    def _load_legacy(self):
+        with open(self.save_path, 'rb') as file:
+            buffer = file.read()
+        pos, size = 0, len(buffer)
+        while True:
+            while pos < size and buffer[pos] == 0:  # skip padding
+                pos += 1
+            if pos >= size:
+                return
+            end = buffer.index(b'\x00', pos)
+            key = buffer[pos:end].decode()
+            pos = end + 1
+            end = buffer.index(b'\x00', pos)
+            module_name = buffer[pos:end].decode()
+            pos = end + 1
+            end = buffer.index(b'\x00', pos)
+            class_name = buffer[pos:end].decode()
+            pos = end + 1
+            blk_size = struct.unpack_from('I', buffer, pos)[0]
+            pos += 4
+            logger.info(f"Loading {key} -> {module_name}.{class_name} ({blk_size} bytes)")
+            cls = _model_class(module_name, class_name)
+            self.data[key] = cls.deserialize(buffer[pos:pos + blk_size])
+            pos += blk_size
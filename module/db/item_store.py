@@ -0,0 +1,180 @@
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Iterator, Mapping, MutableMapping, Optional
+
+import orjson
+
+# ────────────────────────────────────────────────────────────────────────────────
+# File layout (little endian)
+#   header  magic, item count
+#   index   count * (name offset, name length, data offset, data length),
+#           sorted by utf-8 encoded name
+#   names   utf-8 encoded lowercase item names
+#   data    orjson encoded item dicts
+# All offsets are absolute file positions.
+# ────────────────────────────────────────────────────────────────────────────────
+MAGIC = b"NCHIDB01"
+HEADER = struct.Struct("<8sI")
+ENTRY = struct.Struct("<IIII")
+
+
+class MappedItemStore(Mapping):
+    """
+    Read-only item table backed by a memory-mapped file.
+
+    The file is mapped once and looked up with a binary search over the
+    sorted name index, only the requested item is deserialized. Every process
+    mapping the same file shares its pages through the OS page cache.
+
+    A store is never reopened in place while it may be read, a rebuilt file is
+    mapped by a new store swapped into `ItemTable.base`. The old mapping is
+    released once its last reader drops it.
+    """
+
+    def __init__(self, path: os.PathLike | str):
+        self.path = Path(path)
+        self._mm: Optional[mmap.mmap] = None
+        self._count = 0
+        self.open()
+
+    def open(self) -> None:
+        self.close()
+        if not self.path.exists() or not self.path.stat().st_size:
+            return
+        # The mapping keeps its own handle, an unused store is released
+        # as a whole when it is garbage collected.
+        with open(self.path, "rb") as fp:
+            self._mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not an item store file")
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+        self._mm = None
+        self._count = 0
+
+    # Lookups take `self._mm` once and pass it down, so they never see it
+    # change halfway through.
+    @staticmethod
+    def _entry(mm: mmap.mmap, index: int) -> tuple:
+        return ENTRY.unpack_from(mm, HEADER.size + index * ENTRY.size)
+
+    @classmethod
+    def _name(cls, mm: mmap.mmap, index: int) -> bytes:
+        offset, length, _, _ = cls._entry(mm, index)
+        return mm[offset:offset + length]
+
+    def _find(self, mm: Optional[mmap.mmap], key: str) -> int:
+        if mm is None:
+            return -1
+        target = key.encode()
+        count = HEADER.unpack_from(mm, 0)[1]
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._name(mm, mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < count and self._name(mm, lo) == target:
+            return lo
+        return -1
+
+    def __getitem__(self, key: str) -> dict:
+        mm = self._mm
+        index = self._find(mm, key)
+        if index < 0:
+            raise KeyError(key)
+        _, _, offset, length = self._entry(mm, index)
+        return orjson.loads(mm[offset:offset + length])
+
+    def __contains__(self, key) -> bool:
+        return isinstance(key, str) and self._find(self._mm, key) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        mm = self._mm
+        if mm is None:
+            return
+        for index in range(HEADER.unpack_from(mm, 0)[1]):
+            yield self._name(mm, index).decode()
+
+    def __len__(self) -> int:
+        return self._count
+
+    @staticmethod
+    def build(path: os.PathLike | str, data: Mapping[str, dict]) -> None:
+        """
+        Write `data` as a new store file, replacing `path` atomically.
+
+        Raises:
+            PermissionError: If `path` is still mapped by another process on Windows.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        keys = sorted(key.encode() for key in data)
+        blobs = [orjson.dumps(data[key.decode()]) for key in keys]
+
+        index = bytearray()
+        offset = HEADER.size + ENTRY.size * len(keys)
+        name_offset = offset
+        data_offset = offset + sum(len(key) for key in keys)
+        for key, blob in zip(keys, blobs):
+            index += ENTRY.pack(name_offset, len(key), data_offset, len(blob))
+            name_offset += len(key)
+            data_offset += len(blob)
+
+        tmp = path.with_name(f"{path.name}.tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(HEADER.pack(MAGIC, len(keys)))
+            fh.write(index)
+            fh.write(b"".join(keys))
+            fh.write(b"".join(blobs))
+        os.replace(tmp, path)
+
+
+class ItemTable(MutableMapping):
+    """
+    Item cache view: a shared `MappedItemStore` base with a small
+    per-process delta of items written since the base was built.
+    """
+
+    def __init__(self, base: MappedItemStore, delta: Optional[Dict[str, dict]] = None):
+        self.base = base
+        self.delta: Dict[str, dict] = delta or {}
+        self._deleted = set()
+
+    def __getitem__(self, key: str) -> dict:
+        if key in self.delta:
+            return self.delta[key]
+        if key in self._deleted:
+            raise KeyError(key)
+        return self.base[key]
+
+    def __setitem__(self, key: str, value: dict) -> None:
+        self.delta[key] = value
+        self._deleted.discard(key)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self.delta.pop(key, None)
+        self._deleted.add(key)
+
+    def __contains__(self, key) -> bool:
+        if key in self.delta:
+            return True
+        return key not in self._deleted and key in self.base
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.delta
+        for key in self.base:
+            if key not in self.delta and key not in self._deleted:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
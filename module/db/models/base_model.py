@@ -8,6 +8,7 @@ from playwright.sync_api import Locator
 from abc import ABC, abstractmethod
 from copy import deepcopy
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, ClassVar, Iterable, List, Mapping, MutableMapping, Optional, Protocol, Type, TypeVar
 
 try:
@@ -126,6 +127,10 @@ class MongoBackend(StorageBackend):
 # ---------------------------------------------------------------------------
 
 class BaseModel:
+    # no slots of its own, so that CompactModel instances have no __dict__;
+    # plain subclasses such as ItemContainer get one
+    __slots__ = ()
+
     # shared backend across *all* subclasses unless overridden
     _backend: ClassVar[StorageBackend] = LocalBackend()
 
@@ -175,7 +180,7 @@ class BaseModel:
     # ------------------------------------------------------------------
     @property
     def key(self) -> str:
-        k = self.__dict__.get("id") or self.__dict__.get("key")
+        k = getattr(self, "id", None) or self.to_dict().get("key")
         if not k:
             raise AttributeError("Model must have an 'id' or 'key' attribute for persistence")
         return str(k)
@@ -210,19 +215,162 @@ class BaseModel:
         obj_dict = json.loads(gzip.decompress(data).decode())
         return cls(**obj_dict)
 
+    @classmethod
+    def serialize_many(cls, models: Iterable["BaseModel"]) -> bytes:
+        """
+        Gzipped JSON of many models in one stream, stored by column:
+        ``{"count": n, "columns": {attr: [values]}, "missing": {attr: [rows without attr]}}``
+        """
+        rows = [m.to_dict() for m in models]
+        keys = {}
+        for row in rows:
+            keys.update(dict.fromkeys(row))
+        columns = {k: [row.get(k) for row in rows] for k in keys}
+        missing = {}
+        for k in keys:
+            absent = [i for i, row in enumerate(rows) if k not in row]
+            if absent:
+                missing[k] = absent
+        payload = {"count": len(rows), "columns": columns, "missing": missing}
+        return gzip.compress(json.dumps(payload, default=str).encode(), compresslevel=6)
+
+    @classmethod
+    def deserialize_many(cls: Type[T], data: bytes) -> List[T]:
+        payload = json.loads(gzip.decompress(data).decode())
+        if isinstance(payload, list):
+            # one object per row, as written before the column layout
+            return [cls(**obj_dict) for obj_dict in payload]
+        columns = payload["columns"]
+        missing = {k: set(v) for k, v in payload.get("missing", {}).items()}
+        ret = []
+        for i in range(payload["count"]):
+            ret.append(cls(**{
+                k: column[i] for k, column in columns.items()
+                if k not in missing or i not in missing[k]
+            }))
+        return ret
+
     # common unserializable attributes ------------------------------------
     @property
     def locator(self) -> Locator:
-        return self.__dict__.get("_locator", None)
+        return getattr(self, "_locator", None)
+
+    @locator.setter
+    def locator(self, value: Locator) -> None:
+        self._locator = value
 
     @property
     def node(self) -> Locator:
         """Alias for locator."""
         return self.locator
 
+    @node.setter
+    def node(self, value: Locator) -> None:
+        self.locator = value
+
     # pretty repr ---------------------------------------------------------
     def __str__(self) -> str:  # noqa: D401
         return f"<{self.__class__.__name__}: {self.__dict__}>"
 
     __repr__ = __str__
 
+
+# ---------------------------------------------------------------------------
+# CompactModel
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def _slot_fields(cls: type) -> tuple[str, ...]:
+    """All slot names of *cls* and its bases, in definition order."""
+    fields = []
+    for klass in reversed(cls.__mro__):
+        for name in klass.__dict__.get("__slots__", ()):
+            if name not in fields:
+                fields.append(name)
+    return tuple(fields)
+
+
+class CompactModel(BaseModel):
+    """
+    BaseModel with its fields in ``__slots__``, instances have no ``__dict__``.
+
+    Subclasses list their fields in ``__slots__``. ``_locator`` is a slot too,
+    other attributes (``item.profit``, ``item._act``...) go to ``_extra``, a
+    dict created on first use. Names starting with "_" are never serialized.
+    ``to_dict`` is a shallow copy.
+    """
+    __slots__ = ("_locator", "_extra")
+
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self, key, None)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        setattr(self, key, value)
+
+    def __getattr__(self, item: str) -> Any:
+        # only reached when normal lookup failed, an unset slot or an extra attribute
+        if item != "_extra":
+            try:
+                return self._extra[item]
+            except (AttributeError, KeyError):
+                pass
+        raise AttributeError(item)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if hasattr(self.__class__, name):
+            # slots and properties
+            object.__setattr__(self, name, value)
+            return
+        try:
+            extra = object.__getattribute__(self, "_extra")
+        except AttributeError:
+            extra = {}
+            object.__setattr__(self, "_extra", extra)
+        extra[name] = value
+
+    def load_data(self, data: Mapping[str, Any]) -> None:
+        for k, v in data.items():
+            setattr(self, k, v)
+
+    def _attributes(self) -> dict[str, Any]:
+        """Every attribute set on the instance, private ones included."""
+        d = {}
+        for k in _slot_fields(self.__class__):
+            if k == "_extra":
+                continue
+            try:
+                d[k] = object.__getattribute__(self, k)
+            except AttributeError:
+                continue
+        d.update(getattr(self, "_extra", {}))
+        return d
+
+    def to_dict(self) -> MutableMapping[str, Any]:
+        d = {}
+        for k, v in self._attributes().items():
+            if k.startswith("_"):
+                continue
+            if isinstance(v, (list, dict)):
+                v = v.copy()
+            d[k] = v
+        return d
+
+    # copies keep private attributes, the copied locator is the same object
+    def __copy__(self) -> "CompactModel":
+        other = self.__class__.__new__(self.__class__)
+        other.load_data(self._attributes())
+        return other
+
+    def __deepcopy__(self, memo: dict) -> "CompactModel":
+        other = self.__class__.__new__(self.__class__)
+        memo[id(self)] = other
+        other.load_data({
+            k: v if k.startswith("_") else deepcopy(v, memo)
+            for k, v in self._attributes().items()
+        })
+        return other
+
+    def __str__(self) -> str:  # noqa: D401
+        return f"<{self.__class__.__name__}: {self.to_dict()}>"
+
+    __repr__ = __str__
@@ -1,5 +1,6 @@
 import re
-from module.db.models.base_model import BaseModel
+from module.db.models.base_model import CompactModel
+from module.device import extractor
 from playwright.sync_api import Locator
 from datetime import datetime
 from typing import Any, List, TYPE_CHECKING
@@ -8,7 +9,12 @@ import module.jelly_neo as jn
 if TYPE_CHECKING:
     from module.config.config import AzurLaneConfig
 
-class NeoItem(BaseModel):
+class NeoItem(CompactModel):
+    __slots__ = (
+        'name', 'description', 'id', 'index', 'quantity', 'market_price', 'restock_price',
+        'price_timestamp', 'rarity', 'image', 'restock_shop_link', 'parent_container',
+        'item_type', 'effects',
+    )
     name: str
     id: str
     index: int
@@ -19,23 +25,40 @@ class NeoItem(BaseModel):
     image: str
     restock_shop_link: str
     parent_container: str
-    quantity: int = 0
+    quantity: int
     effects: List[str]
 
+    # Attributes of item nodes in item grids, for `Control.extract()`
+    NODE_FIELDS = {
+        'name': ('', 'data-itemname'),
+        'id': ('', 'id'),
+        'image': ('', 'data-image'),
+        'description': ('', 'data-itemdesc'),
+        'rarity': ('', 'data-rarity'),
+        'restock_price': ('', 'data-itemvalue'),
+        'item_type': ('', 'data-itemtype'),
+    }
+
     @classmethod
-    def load_from_locator(cls, locator: Locator) -> 'NeoItem':
+    def load_from_data(cls, data: dict) -> 'NeoItem':
+        '''
+        Args:
+            data (dict): A row of `Control.extract()` with `NODE_FIELDS`.
+        '''
         return cls(
-            name=locator.get_attribute('data-itemname'),
-            id=locator.get_attribute('id'),
-            image=locator.get_attribute('data-image'),
-            description=locator.get_attribute('data-itemdesc'),
-            rarity=locator.get_attribute('data-rarity'),
-            restock_price=locator.get_attribute('data-itemvalue'),
-            item_type=locator.get_attribute('data-itemtype'),
+            **{key: data[key] for key in cls.NODE_FIELDS},
             market_price=0,
-            _locator=locator
+            _locator=data.get('_locator'),
         )
 
+    @classmethod
+    def load_from_locator(cls, locator: Locator) -> 'NeoItem':
+        # extract() doesn't wait, the node may not be attached yet
+        locator.wait_for(state='attached')
+        data = extractor.extract(locator, cls.NODE_FIELDS, locators=False)[0]
+        data['_locator'] = locator
+        return cls.load_from_data(data)
+
     def __init__(self, **kwargs: Any) -> None:
         # sensible defaults
         self.name = ""
@@ -54,11 +77,25 @@ class NeoItem(BaseModel):
         self.effects = []
         super().__init__(**kwargs)
 
-    def update_jn(self, force=False):
+    @staticmethod
+    def batch_update_jn(items: List['NeoItem']) -> List['NeoItem']:
+        '''
+        Update many items with a single batch lookup
+        '''
+        found = jn.batch_search_map([item.name for item in items])
+        for item in items:
+            if item.name in found:
+                item.update_jn(data=found[item.name])
+            else:
+                item.update_jn()
+        return items
+
+    def update_jn(self, force=False, data=None):
         '''
-        Update item data from jellyneo
+        Update item data from jellyneo, or from `data` already looked up
         '''
-        data = jn.get_item_details_by_name(self.name, force=force)
+        if data is None:
+            data = jn.get_item_details_by_name(self.name, force=force)
         if not data:
             return self
         self.id = data.get('id', self.id)
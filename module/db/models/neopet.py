@@ -1,9 +1,14 @@
-from module.db.models.base_model import BaseModel
+from module.db.models.base_model import CompactModel
 from copy import deepcopy
 from typing import Any, List, Optional, MutableMapping
 from playwright.sync_api import Locator
 
-class Neopet(BaseModel):
+class Neopet(CompactModel):
+    __slots__ = (
+        'name', 'health', 'max_health', 'strength', 'defense', 'movement', 'intelligence',
+        'level', 'hunger', 'species', 'color', 'mood', 'is_active', 'petpet', 'equipments',
+        'ailments', 'assignments',
+    )
     name: str
     health: int
     max_health: int
@@ -0,0 +1,176 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Columnar view of the item cache prices, one row per item:
+#   id, market_price, restock_price, rarity, price_timestamp
+# Rows are addressed by lowercase item name through `index`.
+# ────────────────────────────────────────────────────────────────────────────────
+COLUMNS = {
+    "id": np.int64,
+    "market_price": np.int64,
+    "restock_price": np.int64,
+    "rarity": np.int32,
+    "price_timestamp": np.float64,
+}
+
+
+def _field(record, key: str):
+    if isinstance(record, dict):
+        value = record.get(key)
+    else:
+        value = getattr(record, key, None)
+    try:
+        return value and float(value) or 0
+    except (TypeError, ValueError):
+        return 0
+
+
+class _Table(NamedTuple):
+    names: List[str]
+    index: Dict[str, int]
+    columns: Dict[str, np.ndarray]
+
+
+class PriceSnapshot:
+    """
+    Price columns of many items, so profit, filtering and ranking over a
+    whole shop or SDB page run as array operations instead of per-item
+    attribute access.
+
+    Records may be item dicts of the cache or objects with the same
+    attributes (`NeoItem`). Missing or malformed values become 0.
+
+    Updates build a new table and swap it in with a single assignment,
+    readers take `self.table` once per call and never lock.
+    """
+
+    def __init__(self, records: Iterable = ()):
+        self.table = _Table([], {}, {
+            key: np.zeros(0, dtype=dtype) for key, dtype in COLUMNS.items()
+        })
+        self.update(records)
+
+    @property
+    def names(self) -> List[str]:
+        return self.table.names
+
+    @property
+    def index(self) -> Dict[str, int]:
+        return self.table.index
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        return self.table.columns
+
+    def __len__(self) -> int:
+        return len(self.table.names)
+
+    def __contains__(self, name) -> bool:
+        return isinstance(name, str) and name.lower() in self.table.index
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self.table.columns[key]
+
+    def update(self, records: Iterable) -> None:
+        """
+        Overwrite the rows of known items, append the others.
+        Writers must be serialized by the caller, such as with `DB_LOCK`.
+        """
+        records = [r for r in records if r is not None and self._name(r)]
+        if not records:
+            return
+        table = self.table
+        names, index = table.names, table.index
+        rows = []
+        for record in records:
+            name = self._name(record).lower()
+            row = index.get(name)
+            if row is None:
+                if index is table.index:
+                    names, index = list(names), dict(index)
+                row = len(names)
+                index[name] = row
+                names.append(name)
+            rows.append(row)
+        grow = len(names) - len(table.names)
+        columns = {}
+        for key, dtype in COLUMNS.items():
+            column = table.columns[key]
+            column = np.concatenate((column, np.zeros(grow, dtype=dtype))) if grow else column.copy()
+            column[rows] = np.fromiter((_field(r, key) for r in records), dtype=dtype, count=len(records))
+            columns[key] = column
+        self.table = _Table(names, index, columns)
+
+    @staticmethod
+    def _name(record) -> str:
+        if isinstance(record, dict):
+            return record.get("name") or ""
+        return getattr(record, "name", "") or ""
+
+    def rows(self, names: Sequence[str], table: _Table = None) -> np.ndarray:
+        """
+        Row of each name, -1 for the ones not in the snapshot.
+        """
+        index = (table or self.table).index
+        return np.fromiter((index.get(n.lower(), -1) for n in names), dtype=np.int64, count=len(names))
+
+    def column(self, key: str, names: Sequence[str], table: _Table = None) -> np.ndarray:
+        """
+        Values of `key` for `names`, 0 for the ones not in the snapshot.
+        """
+        table = table or self.table
+        rows = self.rows(names, table)
+        ret = np.zeros(len(rows), dtype=COLUMNS[key])
+        found = rows >= 0
+        ret[found] = table.columns[key][rows[found]]
+        return ret
+
+    def profit(self, names: Sequence[str], restock_price: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        Args:
+            names (Sequence[str]):
+            restock_price (Sequence[int]): Prices seen on the page,
+                the cached restock price of each item if omitted.
+
+        Returns:
+            np.ndarray: market_price - restock_price of each name.
+        """
+        table = self.table
+        market = self.column("market_price", names, table)
+        if restock_price is None:
+            restock = self.column("restock_price", names, table)
+        else:
+            restock = np.asarray(restock_price, dtype=np.int64)
+        return market - restock
+
+    def rank_profit(
+            self,
+            names: Sequence[str],
+            restock_price: Optional[Sequence[int]] = None,
+            min_profit: int = 1,
+            k: int = 0,
+        ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns:
+            np.ndarray: Profit of each name.
+            np.ndarray: Indices into `names` of the items making at least
+                `min_profit`, most profitable first (top `k` if given).
+        """
+        profit = self.profit(names, restock_price)
+        candidates = np.flatnonzero(profit >= min_profit)
+        if k and k < len(candidates):
+            candidates = candidates[np.argpartition(-profit[candidates], k - 1)[:k]]
+            candidates.sort()  # keep ties in page order
+        order = candidates[np.argsort(-profit[candidates], kind="stable")]
+        return profit, order
+
+    def argsort(self, names: Sequence[str], key: str = "market_price", descending: bool = False) -> np.ndarray:
+        """
+        Indices into `names` ordered by `key`, ties keep their given order.
+        """
+        values = self.column(key, names)
+        if descending:
+            values = -values
+        return np.argsort(values, kind="stable")
@@ -9,6 +9,8 @@ from playwright.sync_api import sync_playwright, Page, Browser, Playwright
 from playwright._impl._errors import TargetClosedError
 from playwright._impl._errors import Error as PlaywrightError
 from module.config.config import AzurLaneConfig
+from module.device.network import NetworkFilter
+from module.device.scripts import DEFAULT_SCRIPTS, Scripts
 from module.logger import logger
 from module.base.utils import (
     ensure_time,
@@ -45,6 +47,12 @@ class Connection:
         self.browser = None
         self.url = ""
         self.page = None
+        # Context of `register_init_scripts()` and versions of its scripts
+        self.init_scripts_context = None
+        self.init_scripts = {}
+        # Request blocking rules of the running task, see `set_network_filter()`
+        self.network_filter: NetworkFilter | None = None
+        self.network_filter_context = None
 
     @staticmethod
     def sleep(second):
@@ -126,6 +134,7 @@ class Connection:
         if self.pw:
             self.pw.stop()
         self.context = None
+        self.network_filter_context = None
         self.pw = None
         self.page = None
 
@@ -234,8 +243,72 @@ class Connection:
             else:
                 self.page = self.context.pages[0] if self.context.pages else self.new_page()
             self.goto("about:blank")
+        self.register_init_scripts()
+        self.install_network_filter()
         logger.info("Browser started.")
 
+    def register_init_scripts(self):
+        """
+        Run `DEFAULT_SCRIPTS` on every document of the context, before page scripts,
+        instead of evaluating them after each navigation.
+        Scripts registered through CDP are gone when the connection closes,
+        call again after reconnecting.
+        """
+        registered = {}
+        for name in DEFAULT_SCRIPTS:
+            content = Scripts.get(name)
+            if content is None:
+                continue
+            self.context.add_init_script(script=content)
+            registered[name] = Scripts.version(name)
+        logger.info(f"Registered init scripts: {list(registered)}")
+        self.init_scripts = registered
+        self.init_scripts_context = self.context
+
+    def set_network_filter(self, network_filter: NetworkFilter | None):
+        """
+        Replace request blocking rules of the context.
+
+        Args:
+            network_filter (NetworkFilter): None to load everything.
+        """
+        if self.network_filter is not None:
+            self.network_filter.log_summary()
+        self.network_filter = network_filter
+        self.install_network_filter()
+
+    def install_network_filter(self):
+        """
+        Route requests of the context through `network_filter`.
+        The route is only kept while there are rules, every routed request
+        costs a round trip to this process.
+        """
+        context = getattr(self, 'context', None)
+        enabled = self.network_filter is not None and context is not None
+        if self.network_filter_context is not None \
+                and (not enabled or self.network_filter_context is not context):
+            try:
+                self.network_filter_context.unroute('**/*', self._route_network)
+                self.network_filter_context.remove_listener('response', self._on_network_response)
+            except PlaywrightError:
+                # Context closed
+                pass
+            self.network_filter_context = None
+        if enabled and self.network_filter_context is None:
+            context.route('**/*', self._route_network)
+            context.on('response', self._on_network_response)
+            self.network_filter_context = context
+
+    def _route_network(self, route):
+        if self.network_filter is None:
+            route.fallback()
+        else:
+            self.network_filter.on_route(route)
+
+    def _on_network_response(self, response):
+        if self.network_filter is not None:
+            self.network_filter.on_response(response)
+
     def clean_redundant_pages(self, keeps:int=3):
         for p in self.context.pages:
             if p == self.page:
@@ -314,3 +387,5 @@ class Connection:
         self.browser = self.pw.chromium.connect_over_cdp(f"http://{address}")
         self.context = self.browser.contexts[0]
         self.page = self.context.pages[0]
+        self.register_init_scripts()
+        self.install_network_filter()
@@ -1,4 +1,4 @@
-import os
+import time
 import numpy as np
 from typing import Callable
 from random import randint
@@ -7,9 +7,26 @@ from module.base import utils
 from functools import cached_property
 from module.logger import logger
 from module.device.connection import Connection
+from module.device import extractor
+from module.device.scripts import Scripts
 from playwright.sync_api import Locator
+from playwright._impl._errors import TimeoutError as PlaywrightTimeoutError
+from playwright._impl._errors import Error as PlaywrightError
 from typing import Union
 
+# Errors raised while the page navigates or reloads, a wait can be retried on the new document
+NAVIGATION_ERRORS = (
+    'execution context was destroyed',
+    'cannot find context with specified id',
+    'frame was detached',
+)
+
+
+def is_navigation_error(error: PlaywrightError) -> bool:
+    message = str(error).lower()
+    return any(e in message for e in NAVIGATION_ERRORS)
+
+
 class Control(Connection):
 
     def handle_control_check(self, button):
@@ -39,28 +56,94 @@ class Control(Connection):
                          *locators:list[str | Locator],
                          timeout:float=None,
                          wait_interval:float=1,
-                         condition:Callable=None,
+                         condition:str | Callable=None,
                          gone:bool=False) -> Locator:
         '''
         Wait until one of the selectors is met given condition.
+        Waits happen in page and return as soon as the condition holds,
+        except for python `condition` which is polled every `wait_interval`.
 
         Args:
             locators (list): List of queryString or locators to check.
             timeout (float): Timeout in seconds.
-            wait_interval (float): Interval to wait between each check.
-            condition (Callable): Condition to check. If None, will check if the element is visible and found.
-            gone (bool): If True, will wait until the element is invisible.
+            wait_interval (float): Interval between checks of a python `condition`.
+            condition (str | Callable): Condition to check. If None, will check if the element is visible and found.
+                A JS predicate such as `node => node.innerText.includes("Done")` is evaluated in page,
+                locators must be css selectors then.
+                A python callable receives each Locator.
+            gone (bool): If True, will wait until none of the elements is visible.
 
         Returns:
-            Locator: The first locator that meets the condition.
+            Locator: The first locator that meets the condition, False if timeout.
         '''
-        if not condition:
-            if gone:
-                condition = lambda x: x.count() > 0 and not x.is_visible()
-            else:
-                condition = lambda x: x.count() > 0 and x.is_visible()
         if not timeout:
             timeout = self.config.Playwright_DefaultTimeout
+        if callable(condition):
+            return self._poll_for_element(locators, timeout, wait_interval, condition)
+        deadline = time.time() + timeout
+        while 1:
+            remain = deadline - time.time()
+            if remain <= 0:
+                break
+            try:
+                if condition:
+                    ret = self._wait_for_element_predicate(locators, condition, remain)
+                else:
+                    ret = self._wait_for_element_visible(locators, gone, remain)
+            except PlaywrightTimeoutError:
+                break
+            except PlaywrightError as e:
+                if not is_navigation_error(e):
+                    raise
+                logger.warning(f"Page navigated while waiting for element {locators}: {e}")
+                self.sleep(0.1)
+                continue
+            if ret:
+                return ret
+        logger.warning(f"Timeout waiting for element: {locators}")
+        return False
+
+    def _wait_for_element_visible(self, locators, gone, timeout) -> Locator | None:
+        locators = [self.page.locator(loc) if isinstance(loc, str) else loc for loc in locators]
+        visible = [loc.locator('visible=true') for loc in locators]
+        race = visible[0]
+        for loc in visible[1:]:
+            race = race.or_(loc)
+        race.first.wait_for(state='detached' if gone else 'attached', timeout=timeout * 1000)
+        if gone:
+            # not filtered by visibility, callers may wait for it to show up again
+            return locators[0]
+        for loc in visible:
+            if loc.count():
+                return loc.first
+        # Gone again before `count()`
+        return None
+
+    def _wait_for_element_predicate(self, locators, condition, timeout) -> Locator:
+        selectors = []
+        for loc in locators:
+            if not isinstance(loc, str):
+                raise ValueError(f"JS condition needs css selectors, got {loc}")
+            selectors.append(loc)
+        handle = self.page.wait_for_function(
+            """selectors => {
+                const predicate = (%s);
+                for (let i = 0; i < selectors.length; i++) {
+                    const nodes = document.querySelectorAll(selectors[i]);
+                    for (let j = 0; j < nodes.length; j++)
+                        if (predicate(nodes[j])) return [i, j];
+                }
+                return false;
+            }""" % condition,
+            arg=selectors,
+            polling='mutation',
+            timeout=timeout * 1000,
+        )
+        i, j = handle.json_value()
+        handle.dispose()
+        return self.page.locator(selectors[i]).nth(j)
+
+    def _poll_for_element(self, locators, timeout, wait_interval, condition) -> Locator:
         while timeout > 0:
             node = None
             for selector in locators:
@@ -86,6 +169,37 @@ class Control(Connection):
         logger.warning(f"Timeout waiting for element: {locators}")
         return False
 
+    def extract(self,
+                rows: str | Locator,
+                fields: dict,
+                required: str | list[str] = None,
+                locators: bool = True) -> list[dict]:
+        '''
+        Read fields of every row with one browser call, instead of
+        several locator calls per row.
+
+        Args:
+            rows (str | Locator): Selector or locator of row elements.
+            fields (dict): Key: Output key. Value: `selector`, `(selector, attr)` or `(selector, attr, many)`.
+                Selector is relative to the row, '' for the row itself.
+                Attr is 'text', 'inner_text', 'count', '.property' or an attribute name.
+            required (str | list[str]): Drop rows with any of these fields empty.
+            locators (bool): Add `_locator` of each row, `rows.nth(_index)`.
+
+        Returns:
+            list[dict]: Plain dicts of `fields`, with `_index` of the row.
+
+        Examples:
+            self.device.extract('.shop-item', {
+                'name': '.item-name',
+                'stock': ('.item-stock', 'text', True),
+                'image': ('img', '.src'),
+            }, required='name')
+        '''
+        if isinstance(rows, str):
+            rows = self.page.locator(rows)
+        return extractor.extract(rows, fields, required=required, locators=locators)
+
     def scroll_to(self, x:int=0, y:int=0, loc:Locator=None):
         if loc:
             bb = None
@@ -305,13 +419,10 @@ class Control(Connection):
         return ret
 
     def execute_script(self, script_name):
-        path = os.path.join('tasks', 'scripts', f'{script_name}.js')
-        if not os.path.exists(path):
-            logger.error(f"Script {script_name} not found at {path}.")
+        script_content = Scripts.get(script_name)
+        if script_content is None:
             return
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                script_content = f.read()
             result = self.eval(script_content)
             logger.info(f"Script {script_name} executed successfully.")
             return result
@@ -320,7 +431,18 @@ class Control(Connection):
             return
 
     def run_default_scripts(self):
+        '''
+        Default scripts are injected into each document by `register_init_scripts()`,
+        this only evaluates them when they are not registered on the context,
+        or after editing them.
+        '''
         try:
+            if self.init_scripts_context is not None and self.init_scripts_context is self.context:
+                if all(Scripts.version(name) == version for name, version in self.init_scripts.items()):
+                    return
+                # Edited during development. Documents loaded from now on also run the new
+                # version, previous versions stay registered until the browser restarts.
+                self.register_init_scripts()
             # Remove annoying popups
             self.execute_script('remove_antiadb')
             self.execute_script('remove_popups')
@@ -1,7 +1,8 @@
 import collections
 import numpy as np
 from playwright.sync_api import Locator
-from lxml import etree
+from playwright._impl._errors import Error as PlaywrightError
+from lxml import etree, html
 
 from module.device.env import IS_WINDOWS
 
@@ -42,6 +43,17 @@ def show_function_call():
     func_list = [f'\n{format_(*row)}' for row in func_list]
     logger.info('Function calls:' + ''.join(func_list))
 
+def xpath_class(name: str) -> str:
+    """
+    XPath predicate of elements having css class `name`, lxml has no css selectors
+    without cssselect.
+
+    Examples:
+        doc.xpath(f"//div[{xpath_class('inv-total-count')}]//b")
+    """
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
 class Device(Control, Screenshot):
     _screen_size_checked = False
     detect_record = set()
@@ -75,6 +87,43 @@ class Device(Control, Screenshot):
         self.stuck_record_check()
         return super().dump_hierarchy()
 
+    def fetch(self, url: str, timeout: float = None) -> html.HtmlElement | None:
+        """
+        GET `url` with cookies of the browser context and parse it, without navigating the page.
+        For reading server-rendered pages only, content created by scripts is not there.
+
+        Args:
+            url (str):
+            timeout (float): Timeout in seconds.
+
+        Returns:
+            html.HtmlElement: Root of the document, None if the request failed,
+                was redirected to login, or the site is under maintenance.
+                Callers should fall back to the browser then.
+        """
+        if not timeout:
+            timeout = self.config.Playwright_DefaultTimeout
+        logger.info(f"Fetching {url}")
+        try:
+            response = self.context.request.get(url, timeout=timeout * 1000)
+        except PlaywrightError as e:
+            logger.warning(f"Failed to fetch {url}: {e}")
+            return None
+        try:
+            if not response.ok:
+                logger.warning(f"Failed to fetch {url}: HTTP {response.status}")
+                return None
+            if '/login/' in response.url:
+                logger.warning(f"Failed to fetch {url}: not logged in")
+                return None
+            body = response.body()
+        finally:
+            response.dispose()
+        if b'Maintenance Tunnels' in body:
+            logger.warning(f"Failed to fetch {url}: site is under maintenance")
+            return None
+        return html.fromstring(body)
+
     def release_during_wait(self):
         return
 
@@ -0,0 +1,82 @@
+from typing import Any, Union
+
+from playwright.sync_api import Locator
+
+# Keep this module free of config imports, models use it to read their own nodes.
+
+# Field readers, anything else is read with getAttribute()
+TEXT = 'text'              # textContent, trimmed
+INNER_TEXT = 'inner_text'  # innerText, trimmed, follows CSS visibility
+COUNT = 'count'            # number of nodes matching the selector
+PROPERTY = '.'             # prefix of DOM properties, such as '.src' for the resolved image url
+
+EXTRACT_JS = """(rows, {fields, required}) => {
+    const read = (node, attr) => {
+        if (attr === 'text') return (node.textContent || '').trim();
+        if (attr === 'inner_text') return (node.innerText || '').trim();
+        if (attr.startsWith('.')) return node[attr.slice(1)] ?? null;
+        return node.getAttribute(attr);
+    };
+    const ret = [];
+    rows.forEach((row, index) => {
+        const data = {_index: index};
+        for (const [key, [selector, attr, many]] of Object.entries(fields)) {
+            const nodes = selector ? Array.from(row.querySelectorAll(selector)) : [row];
+            if (attr === 'count') data[key] = nodes.length;
+            else if (many) data[key] = nodes.map(node => read(node, attr));
+            else data[key] = nodes.length ? read(nodes[0], attr) : null;
+        }
+        if (required.some(key => !data[key])) return;
+        ret.push(data);
+    });
+    return ret;
+}"""
+
+
+def normalize_fields(fields: dict[str, Union[str, tuple]]) -> dict[str, tuple[str, str, bool]]:
+    """
+    Args:
+        fields: Key: Output key. Value: one of
+            - `selector`, text of the first match
+            - `(selector, attr)`
+            - `(selector, attr, many)`, list of `attr` of all matches if `many`
+            Selector is relative to the row, '' for the row itself.
+
+    Returns:
+        dict: Key: Output key. Value: (selector, attr, many)
+    """
+    ret = {}
+    for key, spec in fields.items():
+        if isinstance(spec, str):
+            spec = (spec, TEXT)
+        selector, attr, *many = spec
+        ret[key] = (selector or '', attr or TEXT, bool(many and many[0]))
+    return ret
+
+
+def extract(rows: Locator, fields: dict, required: Union[str, list[str]] = None, locators: bool = True) -> list[dict[str, Any]]:
+    """
+    Read `fields` of every element matched by `rows` with a single browser call.
+
+    Args:
+        rows (Locator): Row elements.
+        fields (dict): See `normalize_fields()`.
+        required (str, list[str]): Rows with any of these fields empty are dropped.
+        locators (bool): Add `_locator` of each row, `rows.nth(_index)`.
+
+    Returns:
+        list[dict]: Values of `fields` with `_index`, index of the row in `rows`,
+            and `_locator` if `locators`.
+    """
+    if isinstance(required, str):
+        required = [required]
+    data = rows.evaluate_all(EXTRACT_JS, {
+        'fields': normalize_fields(fields),
+        'required': list(required or []),
+    })
+    if locators:
+        # Locators are lazy, building them costs no round trip.
+        # Same as `rows.all()`, a row moved by a re-render is not followed.
+        for row in data:
+            row['_locator'] = rows.nth(row['_index'])
+    return data
@@ -0,0 +1,97 @@
+import fnmatch
+import re
+from collections import Counter
+
+from module.logger import logger
+
+
+def parse_lines(text: str | None) -> list[str]:
+    return [line.strip() for line in (text or '').split('\n') if line.strip()]
+
+
+def compile_globs(patterns: list[str]) -> re.Pattern | None:
+    """
+    Returns:
+        re.Pattern: Matches urls matching any of the glob patterns, None if no patterns.
+    """
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{fnmatch.translate(p)})' for p in patterns), re.IGNORECASE)
+
+
+class NetworkFilter:
+    """
+    Request blocking rules of a task, checked by the context level route of `Connection`.
+
+    Requests matching `allow_urls` are always loaded, otherwise requests of
+    `block_types` resource types or matching `block_urls` are aborted.
+    The main document of a page is never blocked.
+    """
+
+    def __init__(self, block_types=(), block_urls=(), allow_urls=()):
+        self.block_types = frozenset(t.lower() for t in block_types)
+        self.block_urls = compile_globs(list(block_urls))
+        self.allow_urls = compile_globs(list(allow_urls))
+        # Blocked requests by resource type
+        self.blocked = Counter()
+        # Estimated from the average size of loaded responses of the same resource type
+        self.saved_bytes = 0
+        # resource type -> [responses, total bytes]
+        self._loaded: dict[str, list[int]] = {}
+
+    @classmethod
+    def from_config(cls, config) -> 'NetworkFilter | None':
+        """
+        Args:
+            config (AzurLaneConfig): Bound to the task.
+
+        Returns:
+            NetworkFilter: None if the filter of the task is disabled.
+        """
+        if not config.NetworkFilter_Enable:
+            return None
+        return cls(
+            block_types=parse_lines(config.NetworkFilter_BlockResourceTypes),
+            block_urls=parse_lines(config.NetworkFilter_BlockUrls),
+            allow_urls=parse_lines(config.NetworkFilter_AllowUrls),
+        )
+
+    def should_block(self, request) -> bool:
+        url = request.url
+        if self.allow_urls is not None and self.allow_urls.match(url):
+            return False
+        if request.resource_type == 'document' and request.frame.parent_frame is None:
+            return False
+        if request.resource_type in self.block_types:
+            return True
+        return self.block_urls is not None and bool(self.block_urls.match(url))
+
+    def on_route(self, route) -> None:
+        request = route.request
+        if self.should_block(request):
+            resource_type = request.resource_type
+            self.blocked[resource_type] += 1
+            count, total = self._loaded.get(resource_type, (0, 0))
+            if count:
+                self.saved_bytes += total // count
+            route.abort('blockedbyclient')
+        else:
+            route.fallback()
+
+    def on_response(self, response) -> None:
+        # Headers of the response event, no round trip
+        length = response.headers.get('content-length')
+        if not length or not length.isdigit():
+            return
+        record = self._loaded.setdefault(response.request.resource_type, [0, 0])
+        record[0] += 1
+        record[1] += int(length)
+
+    def summary(self) -> str:
+        total = sum(self.blocked.values())
+        detail = ', '.join(f'{k}: {v}' for k, v in self.blocked.most_common())
+        return f'{total} requests blocked ({detail}), about {self.saved_bytes / 1024:.0f} KB saved'
+
+    def log_summary(self) -> None:
+        if self.blocked:
+            logger.info(f'Network filter: {self.summary()}')
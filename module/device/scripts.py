@@ -0,0 +1,65 @@
+import os
+import threading
+
+from module.logger import logger
+
+SCRIPT_DIR = os.path.join('tasks', 'scripts')
+# Injected into every document, see `Connection.register_init_scripts()`
+DEFAULT_SCRIPTS = ('remove_antiadb', 'remove_popups')
+
+
+class ScriptRegistry:
+    """
+    In-memory cache of `tasks/scripts/<name>.js`.
+
+    A script is read once, and read again only when the file's mtime changes,
+    so edits take effect without restarting.
+    """
+
+    def __init__(self, folder: str = SCRIPT_DIR):
+        self.folder = folder
+        # name -> (mtime_ns, content)
+        self.scripts: dict[str, tuple[int, str]] = {}
+        self._lock = threading.Lock()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.folder, f'{name}.js')
+
+    def get(self, name: str) -> str | None:
+        """
+        Returns:
+            str: Script content, None if the script does not exist.
+        """
+        path = self.path(name)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            logger.error(f"Script {name} not found at {path}.")
+            return None
+        with self._lock:
+            cached = self.scripts.get(name)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        if cached is not None:
+            logger.info(f"Script {name} changed, reloaded")
+        with self._lock:
+            self.scripts[name] = (mtime, content)
+        return content
+
+    def version(self, name: str) -> int:
+        """
+        Returns:
+            int: mtime of the cached content, 0 if not loaded.
+        """
+        self.get(name)
+        with self._lock:
+            return self.scripts.get(name, (0, ''))[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.scripts.clear()
+
+
+Scripts = ScriptRegistry()
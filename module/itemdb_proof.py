@@ -0,0 +1,89 @@
+import hashlib
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from threading import Lock
+
+# Keep this module free of project imports, pool workers import it on spawn.
+
+NONCE_LIMIT = 10_000_000
+NONCE_BATCH = 1 << 16
+PROCESS_POOL_DIFFICULTY = 20  # below this a single thread is faster than starting the pool
+
+_Pool: ProcessPoolExecutor | None = None
+_PoolLock = Lock()
+
+
+def _target(difficulty: int) -> tuple[int, bytes]:
+    """
+    A digest has `difficulty` leading zero bits when its first `size` bytes,
+    compared as big endian, are below `bound`.
+    """
+    size = (difficulty + 7) // 8
+    return size, (1 << (size * 8 - difficulty)).to_bytes(size, "big")
+
+
+def search(prefix: str, difficulty: int, start: int, stop: int) -> int:
+    """
+    First nonce in [start, stop) whose sha256(prefix + nonce) has
+    `difficulty` leading zero bits, or -1.
+    """
+    if difficulty <= 0:
+        return start
+    size, bound = _target(difficulty)
+    base = hashlib.sha256(prefix.encode())
+    for nonce in range(start, stop):
+        h = base.copy()
+        h.update(str(nonce).encode())
+        if h.digest()[:size] < bound:
+            return nonce
+    return -1
+
+
+def _pool() -> ProcessPoolExecutor:
+    global _Pool
+    with _PoolLock:
+        if _Pool is None:
+            _Pool = ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) - 1))
+        return _Pool
+
+
+def _search_parallel(prefix: str, difficulty: int, limit: int) -> int:
+    pool = _pool()
+    pending = {
+        pool.submit(search, prefix, difficulty, start, min(start + NONCE_BATCH, limit))
+        for start in range(0, limit, NONCE_BATCH)
+    }
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            found = [f.result() for f in done if f.result() >= 0]
+            if found:
+                return min(found)
+        return -1
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def solve(prefix: str, difficulty: int, limit: int = 0) -> int:
+    """
+    Args:
+        prefix (str): Hashed text before the nonce.
+        difficulty (int): Required leading zero bits.
+        limit (int): Nonces to try, 16x the expected work by default.
+
+    Returns:
+        int: A valid nonce, or -1 if none was found within `limit`.
+    """
+    limit = limit or max(1, min(2 ** (difficulty + 4), NONCE_LIMIT))
+    if difficulty < PROCESS_POOL_DIFFICULTY or limit <= NONCE_BATCH:
+        return search(prefix, difficulty, 0, limit)
+    return _search_parallel(prefix, difficulty, limit)
+
+
+def shutdown() -> None:
+    global _Pool
+    with _PoolLock:
+        if _Pool is not None:
+            _Pool.shutdown(wait=False, cancel_futures=True)
+            _Pool = None
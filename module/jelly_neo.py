@@ -4,8 +4,12 @@ import re
 import json
 import base64
 import hashlib
+import math
 from datetime import datetime
-from threading import Thread
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+from itertools import count
+from threading import BoundedSemaphore, Lock, Thread, local
 from time import sleep, time
 from urllib.parse import quote
 from http.cookies import SimpleCookie
@@ -14,6 +18,7 @@ import requests
 from bs4 import BeautifulSoup as BS
 from module.base.utils import str2int
 from module.config.utils import deep_get
+from module import itemdb_proof
 from module.db import data_manager as dm
 from module.logger import logger
 
@@ -50,9 +55,22 @@ JELLYNEO_HEADERS = {
 }
 
 WORKER_COUNT = 20
-WorkerThreads: list[Thread] = []
-WorkerFlags = [False] * WORKER_COUNT
-_ProofCache: dict[str, str] = {}
+ITEMDB_BULK_SIZE = 50
+LOOKUP_TIMEOUT = 120    # seconds a batch lookup waits before giving up on pending items
+REFRESH_INTERVAL = 60   # seconds between refresh-ahead passes
+REFRESH_HOT_COUNT = 200  # most requested names considered per pass
+HOST_CONCURRENCY = {
+    "itemdb.com.br": 4,
+    "items.jellyneo.net": 4,
+}
+HostSemaphores = {
+    host: BoundedSemaphore(limit) for host, limit in HOST_CONCURRENCY.items()
+}
+ITEMDB_PROOF_PREFIX = "itemdb_proof:"
+ITEMDB_PROOF_TTL = 60 * 60  # for cookies without an `exp` claim
+_ProofCache: dict[str, tuple[float, str]] = {}  # key -> (expires at, proof)
+_ProofLocks: dict[str, Lock] = {}
+_ProofLock = Lock()
 ItemDB_RateLimitTime = 0
 ITEMDB_RATE_LIMIT_COOLDOWN = 60 * 60
 
@@ -111,8 +129,12 @@ def get_item_details_by_name(
     """
     item_name = item_name.lower()
     agent = agent or Agent
-    if not force and dm.is_cached(item_name):
-        return dm.ItemDatabase.get(item_name) or dm._redis_get_item(item_name)  # type: ignore[attr-defined]
+    if not force:
+        cached = dm.ItemDatabase.get(item_name) or dm._redis_get_item(item_name)  # type: ignore[attr-defined]
+        if dm.is_servable(cached):
+            if not dm._is_fresh(cached):  # type: ignore[attr-defined]
+                Lookup.refresh([item_name])
+            return cached
     try:
         data = get_itemdb(item_name, agent=agent, timeout=timeout)
     except Exception as exc:  # noqa: BLE001
@@ -171,7 +193,7 @@ def get_jellyneo_item_details(
         logger.warning("No price history for %s", data["name"])
         data["market_price"] = 999_999
         # set to expire after a day
-        data["price_timestamp"] = datetime.now().timestamp() - dm.JN_CACHE_TTL + 60*60*24
+        data["ttl"] = 60*60*24
     dm.save_cache(data)
     return data
 
@@ -241,59 +263,257 @@ def _populate_from_detail_page(doc: BS, ret: dict) -> None:
 
 
 # ──────────────────────────  Batch-search workers  ────────────────────────────
-def batch_search_worker(items: list[str], ret: list[dict], wid: int) -> None:
-    logger.info("Worker#%d → %s", wid, items)
-    try:
-        missing = []
-        for item in items:
-            idx = next((i for i, x in enumerate(ret) if x["name"] == item), 0)
-            if dm.is_cached(item):
-                ret[idx] = dm.ItemDatabase[item.lower()]
-            else:
-                missing.append(item)
-
-        itemdb_results = get_many_itemdb(missing, agent=AgentPool[wid]) if missing else {}
-        for item in missing:
-            idx = next((i for i, x in enumerate(ret) if x["name"] == item), 0)
-            data = itemdb_results.get(item.lower())
+def _host_slot(host: str) -> BoundedSemaphore:
+    """
+    Per-host concurrency cap shared by all workers.
+    """
+    return HostSemaphores[host]
+
+
+def _chunk(items: list, size: int) -> list[list]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+class ItemLookupService:
+    """
+    Long-lived lookup pool shared by every task of the process.
+
+    Each requested name gets a `Future` resolving to its item dict. Lookups of
+    a name that is already in flight share the same future, so a background
+    task and a foreground task asking for the same item only fetch it once.
+    Misses are looked up with chunked itemdb bulk requests, and whatever
+    itemdb does not know falls back to Jellyneo.
+
+    Expired items still within `dm.CACHE_STALE_GRACE` are resolved right away
+    with the stale data while a refresh runs in the background, and the
+    refresher thread re-fetches the most requested items before they expire.
+    """
+
+    def __init__(self, workers: int = WORKER_COUNT):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ItemLookup")
+        self._inflight: dict[str, Future] = {}
+        self._lock = Lock()
+        self._local = local()
+        self._agent_index = count()
+        self._refreshing: set[str] = set()
+        self._hits = Counter()
+        self._refresher: Thread | None = None
+
+    def _agent(self) -> requests.Session:
+        # pin one pooled session to each executor thread
+        agent = getattr(self._local, "agent", None)
+        if agent is None:
+            agent = AgentPool[next(self._agent_index) % len(AgentPool)]
+            self._local.agent = agent
+        return agent
+
+    def is_busy(self) -> bool:
+        return bool(self._inflight)
+
+    def submit(self, item_name: str) -> Future:
+        return self.submit_many([item_name])[item_name]
+
+    def submit_many(self, item_names: list[str]) -> dict[str, Future]:
+        """
+        Args:
+            item_names (list[str]):
+
+        Returns:
+            dict[str, Future]: Future of each distinct name in `item_names`.
+        """
+        ret: dict[str, Future] = {}
+        created = []
+        with self._lock:
+            for name in item_names:
+                if not name or name in ret:
+                    continue
+                future = self._inflight.get(name.lower())
+                if future is None:
+                    future = Future()
+                    future.set_running_or_notify_cancel()
+                    self._inflight[name.lower()] = future
+                    created.append(name)
+                ret[name] = future
+            self._hits.update(name.lower() for name in ret)
+
+        missing, stale = [], []
+        try:
+            found = dm.get_many(created)
+            for name in created:
+                data = found.get(name.lower())
+                if dm.is_servable(data):
+                    if not dm._is_fresh(data):  # type: ignore[attr-defined]
+                        stale.append(name)
+                    self._resolve(name, data)
+                else:
+                    missing.append(name)
+            for chunk in _chunk(missing, ITEMDB_BULK_SIZE):
+                self.executor.submit(self._search_itemdb, chunk)
+        except Exception as exc:  # noqa: BLE001
+            # nobody else would ever finish the futures created above
+            logger.warning("Item lookup of %d items failed: %s", len(created), exc)
+            for name in created:
+                self._reject(name, exc)
+            return ret
+        self.refresh(stale)
+        return ret
+
+    def refresh(self, item_names: list[str]) -> None:
+        """
+        Re-fetch `item_names` in the background, nobody waits on the result.
+        """
+        queued = []
+        with self._lock:
+            for name in item_names:
+                key = name.lower()
+                if key in self._refreshing or key in self._inflight:
+                    continue
+                self._refreshing.add(key)
+                queued.append(name)
+        for chunk in _chunk(queued, ITEMDB_BULK_SIZE):
+            self.executor.submit(self._search_itemdb, chunk)
+
+    def refresh_ahead(self) -> int:
+        """
+        Queue a refresh of the most requested items that are due to expire,
+        then decay the request counts so only recent demand counts.
+
+        Returns:
+            int: Number of items queued.
+        """
+        with self._lock:
+            hot = [name for name, _ in self._hits.most_common(REFRESH_HOT_COUNT)]
+            for name in list(self._hits):
+                self._hits[name] //= 2
+            self._hits += Counter()  # drop zero counts
+        cached = dm.get_many(hot)
+        due = [name for name in hot if name in cached and dm.is_due(cached[name])]
+        self.refresh(due)
+        return len(due)
+
+    def _refresh_loop(self, interval: float) -> None:
+        while True:
+            sleep(interval)
+            try:
+                queued = self.refresh_ahead()
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Item refresh-ahead failed: %s", exc)
+                continue
+            if queued:
+                logger.info("Refreshing %d items ahead of expiry", queued)
+
+    def start_refresher(self, interval: float = REFRESH_INTERVAL) -> None:
+        """
+        Start the refresh-ahead daemon thread, safe to call more than once.
+        """
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        self._refresher = Thread(
+            target=self._refresh_loop, args=(interval,),
+            name="ItemRefresher", daemon=True
+        )
+        self._refresher.start()
+
+    def _resolve(self, item_name: str, data: dict) -> None:
+        with self._lock:
+            self._refreshing.discard(item_name.lower())
+            future = self._inflight.pop(item_name.lower(), None)
+        if future is not None:
+            future.set_result(data)
+
+    def _reject(self, item_name: str, exc: BaseException) -> None:
+        with self._lock:
+            self._refreshing.discard(item_name.lower())
+            future = self._inflight.pop(item_name.lower(), None)
+        if future is not None:
+            future.set_exception(exc)
+
+    def _search_itemdb(self, chunk: list[str]) -> None:
+        try:
+            with _host_slot("itemdb.com.br"):
+                results = get_many_itemdb(chunk, agent=self._agent())
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("itemdb bulk search failed for %d items: %s", len(chunk), exc)
+            results = {}
+        found = {}
+        for item in chunk:
+            data = results.get(item.lower())
             if data and data["id"]:
-                dm.save_cache(data)
-                ret[idx] = data
+                found[item] = data
                 continue
-
             logger.info("Item %s not found in itemdb bulk response, trying Jellyneo...", item)
-            data = get_jellyneo_item_details(item, agent=AgentPool[wid])
-            ret[idx] = data
-    finally:
-        WorkerFlags[wid] = False
-        logger.info("Worker#%d done", wid)
+            self.executor.submit(self._search_jellyneo, item)
+        for item, data in found.items():
+            self._resolve(item, data)
+        try:
+            dm.save_many(list(found.values()))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed to cache %d items: %s", len(found), exc)
+
+    def _search_jellyneo(self, item_name: str) -> None:
+        try:
+            with _host_slot("items.jellyneo.net"):
+                data = get_jellyneo_item_details(item_name, agent=self._agent())
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Jellyneo lookup failed for %s: %s", item_name, exc)
+            self._reject(item_name, exc)
+            return
+        self._resolve(item_name, data)
+
+
+Lookup = ItemLookupService()
 
 
 def is_busy() -> bool:
-    return any(WorkerFlags)
+    return Lookup.is_busy()
+
+
+def _wait_lookups(futures: dict[str, Future], timeout: float) -> None:
+    _, pending = wait_futures(futures.values(), timeout=timeout)
+    if pending:
+        logger.warning("%d item lookups still pending after %ss", len(pending), timeout)
 
 
-def batch_search(items: list[str], *, join: bool = True) -> list[dict] | None:
-    if is_busy():
-        logger.warning("Workers busy, batch_search aborted")
-        return None
+def batch_search(items: list[str], *, join: bool = True, timeout: float = LOOKUP_TIMEOUT) -> list[dict]:
+    """
+    Resolve many item names at once through the shared `Lookup` pool.
+
+    Args:
+        timeout (float): Seconds to wait when `join`, items still pending
+            are filled in place once their lookups finish.
 
-    ret = [{"name": item} for item in items]
-    buckets = [list(items)] + [[] for _ in range(WORKER_COUNT - 1)]
+    Returns:
+        list[dict]: Item data in the order of `items` (duplicates removed),
+            filled in place as lookups finish when `join=False`.
+    """
+    futures = Lookup.submit_many(list(items))
+    ret = [{"name": name} for name in futures]
 
-    for i, bucket in enumerate(buckets):
-        if bucket:
-            t = Thread(target=batch_search_worker, args=(bucket, ret, i))
-            WorkerThreads.append(t)
-            WorkerFlags[i] = True
-            t.start()
+    def _fill(index: int, future: Future) -> None:
+        if not future.exception():
+            ret[index] = future.result()
 
     if join:
-        for t in WorkerThreads:
-            t.join()
+        _wait_lookups(futures, timeout)
+    for i, future in enumerate(futures.values()):
+        future.add_done_callback(lambda f, i=i: _fill(i, f))
     return ret
 
 
+def batch_search_map(items: list[str], timeout: float = LOOKUP_TIMEOUT) -> dict[str, dict]:
+    """
+    Like `batch_search` but keyed by the names as given,
+    names whose lookup failed or did not finish within `timeout` are omitted.
+    """
+    futures = Lookup.submit_many(list(items))
+    _wait_lookups(futures, timeout)
+    return {
+        name: future.result()
+        for name, future in futures.items()
+        if future.done() and not future.exception()
+    }
+
+
 # ─────────────────────────── Convenience wrappers ────────────────────────────
 def update_item_market_price(item_name: str, price: int) -> bool:
     return dm.update_item_market_price(item_name, price)
@@ -520,20 +740,6 @@ def _decode_jwt_payload(token: str) -> dict:
         return {}
 
 
-def _has_leading_zero_bits(digest: bytes, difficulty: int) -> bool:
-    remaining = difficulty
-    for byte in digest:
-        if remaining <= 0:
-            break
-        if remaining >= 8:
-            if byte != 0:
-                return False
-            remaining -= 8
-            continue
-        return byte >> (8 - remaining) == 0
-    return True
-
-
 def _itemdb_cookie_from_header(cookie_header: str) -> str:
     if not cookie_header:
         return ""
@@ -579,27 +785,76 @@ def ensure_itemdb_cookie(agent: requests.Session) -> str:
     return _itemdb_cookie_from_header(agent.headers.get("Cookie", ""))
 
 
+def _proof_cache_key(cookie_value: str, method: str, path: str) -> str:
+    digest = hashlib.sha1(f"{cookie_value}:{method}:{path}".encode()).hexdigest()
+    return f"{ITEMDB_PROOF_PREFIX}{digest}"
+
+
+def _get_cached_proof(cache_key: str) -> str:
+    now = time()
+    cached = _ProofCache.get(cache_key)
+    if cached and cached[0] > now:
+        return cached[1]
+    try:
+        shared = dm.global_get(cache_key)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Failed to read shared itemdb proof: %s", exc)
+        shared = None
+    if shared:
+        expires_at, proof = shared.split("|", 1)
+        if float(expires_at) > now:
+            _ProofCache[cache_key] = (float(expires_at), proof)
+            return proof
+    return ""
+
+
+def _set_cached_proof(cache_key: str, proof: str, expires_at: float) -> None:
+    now = time()
+    for key, (exp, _) in list(_ProofCache.items()):
+        if exp <= now:
+            _ProofCache.pop(key, None)
+    _ProofCache[cache_key] = (expires_at, proof)
+    try:
+        # shared copies expire by themselves
+        ttl = max(1, math.ceil(expires_at - now))
+        dm.global_set(cache_key, f"{expires_at}|{proof}", ttl=ttl)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Failed to share itemdb proof: %s", exc)
+
+
 def make_itemdb_proof(cookie_value: str, method: str = "GET", path: str = "/") -> str:
+    """
+    Proof-of-work header for an itemdb request, cached per cookie, method and
+    path until the cookie expires and shared with the other instances.
+    """
     payload = _decode_jwt_payload(cookie_value)
     difficulty = payload.get("difficulty")
     if not isinstance(difficulty, int) or difficulty < 0 or difficulty > 24:
         return ""
 
     method = method.upper()
-    cache_key = f"{cookie_value}:{method}:{path}"
-    cached = _ProofCache.get(cache_key)
-    if cached:
-        return cached
-
-    limit = max(1, min(2 ** (difficulty + 4), 10_000_000))
-    for nonce in range(limit):
-        candidate = f"{cookie_value}.{method}.{path}.{nonce}"
-        digest = hashlib.sha256(candidate.encode()).digest()
-        if _has_leading_zero_bits(digest, difficulty):
-            proof = f"{cookie_value}:{nonce}"
-            _ProofCache[cache_key] = proof
+    cache_key = _proof_cache_key(cookie_value, method, path)
+    proof = _get_cached_proof(cache_key)
+    if proof:
+        return proof
+
+    with _ProofLock:
+        lock = _ProofLocks.setdefault(cache_key, Lock())
+    with lock:
+        # another thread may have solved it while we waited
+        proof = _get_cached_proof(cache_key)
+        if proof:
             return proof
-    return ""
+        nonce = itemdb_proof.solve(f"{cookie_value}.{method}.{path}.", difficulty)
+        if nonce >= 0:
+            proof = f"{cookie_value}:{nonce}"
+            expires_at = payload.get("exp")
+            if not isinstance(expires_at, (int, float)):
+                expires_at = time() + ITEMDB_PROOF_TTL
+            _set_cached_proof(cache_key, proof, expires_at)
+    with _ProofLock:
+        _ProofLocks.pop(cache_key, None)
+    return proof
 
 
 def refresh_itemdb_proof_header(agent: requests.Session, path: str, method: str = "GET") -> None:
@@ -47,6 +47,7 @@ from pywebio.session import (
 
 import module.webui.lang as lang
 from module.config.config import AzurLaneConfig, Function
+from module.config.watcher import Watcher
 from module.config.utils import (
     alas_instance,
     alas_template,
@@ -607,14 +608,25 @@ class AlasGUI(Frame):
 
     def _alas_thread_instance_watchdog(self):
         logger.info("Started instance watchdog")
+        # Profiles are re-read only when a config file changes
+        changed = threading.Event()
+        changed.set()
+        unsubscribe = Watcher.subscribe(
+            lambda name: changed.set() if name is None or name.endswith('.json') else None
+        )
+        self_heal = {}
         while self.alive:
             msg = ''
             try:
-                ins = get_all_instance_addresses()
-                for name, addr in ins.items():
-                    with open(f'config/{name}.json', 'r', encoding='utf-8') as f:
-                        conf = json.load(f)
-                    if not conf.get('Alas',{}).get('Playwright', {}).get('SelfHeal', False):
+                if changed.is_set():
+                    changed.clear()
+                    self_heal = {}
+                    for name, addr in get_all_instance_addresses().items():
+                        with open(f'config/{name}.json', 'r', encoding='utf-8') as f:
+                            conf = json.load(f)
+                        self_heal[name] = (addr, conf.get('Alas',{}).get('Playwright', {}).get('SelfHeal', False))
+                for name, (addr, enabled) in self_heal.items():
+                    if not enabled:
                         continue
                     alas = ProcessManager.get_manager(name)
                     msg += f"{name}: {alas.state}\n"
@@ -628,7 +640,9 @@ class AlasGUI(Frame):
                             logger.info(f"Failed to start {name} ({addr}): {e}")
             except Exception as e:
                 logger.info(f"[Watchdog] Unexpected error: {e}")
+                changed.set()
             time.sleep(10)
+        unsubscribe()
 
     def get_snapshot(self) -> bytes:
         address = self.alas_config.Playwright_RemoteDebuggingAddress
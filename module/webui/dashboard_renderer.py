@@ -1,4 +1,5 @@
 from pywebio.output import *
+from module.config.stored import side_store
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -6,7 +7,7 @@ if TYPE_CHECKING:
 
 
 def handle_item_container(kwargs, stored):
-    items = stored.get("value", [])
+    items = side_store.resolve(stored.get("value", []), default=[])
     size = sum(max(1, item.quantity) for item in items if item.category != 'cash')
     return [
         put_text(size).style("--dashboard-value--"),
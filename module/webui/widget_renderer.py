@@ -2,6 +2,7 @@ from turtle import st
 from pywebio.output import *
 from pywebio.session import run_js
 from pywebio.io_ctrl import Output
+from module.config.stored import side_store
 from module.webui.lang import _t, t
 from typing import TYPE_CHECKING, Dict, Union, Any
 from datetime import datetime
@@ -35,7 +36,7 @@ def handle_inventory(kwargs):
     name = kwargs["name"]
     rows = []
     data = kwargs.get('value', {})
-    items: list['NeoItem'] = data.get('value', [])
+    items: list['NeoItem'] = side_store.resolve(data.get('value', []), default=[])
     html = "<div>"
     tmp = ''
     for item in items:
@@ -174,7 +175,8 @@ def generate_item_info_script(item: 'NeoItem'):
 
 def handle_deposit(kwargs):
     try:
-        kwargs['value']['value'] = sorted(kwargs['value']['value'], key=lambda x: x.market_price, reverse=True)
+        items = side_store.resolve(kwargs['value']['value'], default=[])
+        kwargs['value']['value'] = sorted(items, key=lambda x: x.market_price, reverse=True)
     except KeyError:
         pass
     return handle_inventory(kwargs)
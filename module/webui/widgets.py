@@ -11,6 +11,7 @@ from pywebio.output import *
 from pywebio.session import eval_js, local, run_js
 from rich.console import ConsoleRenderable
 
+from module.config.stored import side_store
 from module.logger import WEB_THEME, Highlighter, HTMLConsole, logger
 from module.webui.lang import t
 from module.webui.pin import put_checkbox, put_input, put_select, put_textarea
@@ -371,7 +372,7 @@ def put_arg_stored(kwargs: T_Output_Kwargs) -> Output:
         return renderer.render(name, kwargs)
 
     values = kwargs.pop("value", {})
-    value = values.pop("value", "")
+    value = side_store.resolve(values.pop("value", ""), default=[])
     total = values.pop("total", "")
     time_ = values.pop("time", "")
     comment = values.pop("comment", "")
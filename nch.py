@@ -58,6 +58,8 @@ class Nechouli(AzurLaneAutoScript):
         wt = 3 + ((os.getpid() % 97) / 800.0)
         dm.JN_CACHE_TTL = self.config.ProfileSettings_JellyNeoExpiry * 3600
         dm.load_item_cache()
+        dm.start_cache_sync()
+        jn.Lookup.start_refresher()
         if check_connection(self.config.Playwright_RemoteDebuggingAddress, timeout=0.3):
             self.device.start_browser()
         else:
@@ -11,6 +11,7 @@ from module.config.utils import get_server_next_update
 from module.exception import *
 from playwright._impl._errors import Error as PlaywrightError
 from module.device.device import Device
+from module.device.network import NetworkFilter
 from threading import Thread
 
 from dotenv import load_dotenv
@@ -31,11 +32,14 @@ class BasePageUI(ModuleBase):
                 logger.critical("Cannot run background task when Optimization is set to `close game`")
                 raise RequestHumanTakeover
             logger.info(f"Run task {self.task_name} in background mode")
-            self.config.cross_set(f'{self.task_name}.Scheduler.IsRunningBackground', True)
+            # Flag and reschedule in one write, so the scheduler never sees one without the other
+            with self.config.transaction():
+                self.config.cross_set(f'{self.task_name}.Scheduler.IsRunningBackground', True)
+                self.config.task_cancel()
             self.on_background = True
             Thread(target=self.run_background, daemon=True).start()
-            self.config.task_cancel()
             return True
+        self.device.set_network_filter(NetworkFilter.from_config(self.config))
         try:
             ok = self.main()
             stime = self.config.ProfileSettings_TaskSoftTerminationTime
@@ -55,6 +59,7 @@ class BasePageUI(ModuleBase):
         except Exception as e:
             raise e
         finally:
+            self.device.set_network_filter(None)
             # sync cookies back to manual context
             if self.config.Playwright_Headless:
                 self.debug_screenshot()
@@ -68,6 +73,7 @@ class BasePageUI(ModuleBase):
     def run_background(self):
         self.device = Device(self.config) # playwright cannot share threads
         self.device.start_browser()
+        self.device.set_network_filter(NetworkFilter.from_config(self.config))
         ok = self.main()
         if ok:
             self.calc_next_run()
@@ -77,8 +83,9 @@ class BasePageUI(ModuleBase):
         logger.info(f"Background task {self.task_name} exited")
 
     def stop_background(self):
-        self.config.cross_set(f'{self.task_name}.Scheduler.IsRunningBackground', False)
-        self.config.task_enable()
+        with self.config.transaction():
+            self.config.cross_set(f'{self.task_name}.Scheduler.IsRunningBackground', False)
+            self.config.task_enable()
         self.on_background = False
         self.page.close()
         self.device.stop()
@@ -173,7 +180,18 @@ class BasePageUI(ModuleBase):
             return True
         return False
 
-    def update_np(self) -> int:
+    def update_np(self, doc=None) -> int:
+        """
+        Args:
+            doc (html.HtmlElement): Page from `Device.fetch()`, read the browser page if None.
+        """
+        if doc is not None:
+            node = doc.xpath('//*[@id="npanchor"]')
+            if not node:
+                return self.config.stored.NeoPoints.value or 0
+            np = str2int(node[0].text_content()) or 0
+            self.config.stored.NeoPoints.set(np)
+            return np
         node = self.page.locator('#npanchor')
         if not node.count():
             return self.config.stored.NeoPoints.value or 0
@@ -1,3 +1,4 @@
+import json
 from playwright.sync_api import Locator
 from module.logger import logger
 from tasks.base.base_page import BasePageUI
@@ -5,7 +6,7 @@ from module.exception import TaskError
 from module.base.utils import str2int
 from module.db.models.neopet import Neopet
 from module.db.models.neoitem import NeoItem
-import module.jelly_neo as jn
+from module.db import data_manager as dm
 from module.db.data_map import *
 from typing import List, Any, MutableMapping
 
@@ -37,27 +38,29 @@ class PetCaresUI(BasePageUI):
 
     def scan_all_pets(self):
         self.pets = []
-        nodes = self.page.locator('.slick-slide:not(.slick-cloned) .hp-carousel-nameplate')
-        num = nodes.count()
-        if not num:
+        nodes = self.device.extract('.slick-slide:not(.slick-cloned) .hp-carousel-nameplate', {
+            key: ('', f'data-{key}')
+            for key in ('name', 'health', 'maxhealth', 'hunger', 'level', 'species', 'color', 'mood', 'active')
+        })
+        if not nodes:
             raise TaskError('No pets found')
-        for node in nodes.all():
-            name = node.get_attribute('data-name')
+        for node in nodes:
+            name = node['name']
             if not name: # empty slot
                 continue
             if any(pet.name == name for pet in self.pets):
                 continue
             data = {
                 'name': name,
-                'health': int(node.get_attribute('data-health')),
-                'max_health': int(node.get_attribute('data-maxhealth')),
-                'hunger': int(HUNGER_LEVEL[node.get_attribute('data-hunger')]),
-                'level': int(node.get_attribute('data-level')),
-                'species': node.get_attribute('data-species'),
-                'color': node.get_attribute('data-color'),
-                'mood': node.get_attribute('data-mood'),
-                'is_active': node.get_attribute('data-active') == 'true',
-                '_locator': node,
+                'health': int(node['health']),
+                'max_health': int(node['maxhealth']),
+                'hunger': int(HUNGER_LEVEL[node['hunger']]),
+                'level': int(node['level']),
+                'species': node['species'],
+                'color': node['color'],
+                'mood': node['mood'],
+                'is_active': node['active'] == 'true',
+                '_locator': node['_locator'],
             }
             self.pets.append(Neopet(**data))
             if name in self.config.stored.PetsData:
@@ -101,7 +104,7 @@ class PetCaresUI(BasePageUI):
         self.selected_pet.locator.evaluate('node => node.click()')
         self.device.wait_for_element(
             '#petCareInfoName',
-            condition=lambda node: node.inner_text().strip() == self.selected_pet.name,
+            condition=f'node => node.innerText.trim() === {json.dumps(self.selected_pet.name)}',
         )
 
     def feed_all_pets(self):
@@ -151,11 +154,15 @@ class PetCaresUI(BasePageUI):
         if not items:
             logger.warning(f'No usable items found for pet {self.selected_pet.name}')
             return -1
-        items = sorted(items, key=lambda x: x.market_price)
+        items = self.sort_by_price(items)
         result_node = self.use_item(items[0])
         result_text = result_node.inner_text().lower()
         return max([v for k, v in HUNGER_LEVEL.items() if k in result_text], default=10)
 
+    def sort_by_price(self, items: List[NeoItem]) -> List[NeoItem]:
+        order = dm.price_snapshot().argsort([i.name for i in items], 'market_price')
+        return [items[i] for i in order]
+
     def use_item(self, item: NeoItem) -> Locator:
         logger.info(f'Using item: {item.name} on pet {self.selected_pet.name}')
         item.locator.click()
@@ -202,18 +209,9 @@ class PetCaresUI(BasePageUI):
             if depth > 30:
                 logger.warning("Timeout waiting for all items to load, assume loaded.")
                 break
-        item_names = set()
-        for node in nodes.all():
-            name = node.get_attribute('data-itemname')
-            if not name:
-                continue
-            item_names.add(name)
-            item = NeoItem.load_from_locator(node)
-            item.node = node
-            self.items.append(item)
-        jn.batch_search(item_names)
-        for item in self.items:
-            item.update_jn()
+        for data in self.device.extract(nodes, NeoItem.NODE_FIELDS, required='name'):
+            self.items.append(NeoItem.load_from_data(data))
+        NeoItem.batch_update_jn(self.items)
         return self.items
 
     def play_all_pets(self):
@@ -237,7 +235,7 @@ class PetCaresUI(BasePageUI):
         if not items:
             logger.warning(f'No toys found for pet {self.selected_pet.name}')
             return False
-        items = sorted(items, key=lambda x: x.market_price)
+        items = self.sort_by_price(items)
         self.use_item(items[0])
         return True
 
@@ -248,7 +246,7 @@ class PetCaresUI(BasePageUI):
         if not items:
             logger.warning(f'No grooming items found for pet {self.selected_pet.name}')
             return False
-        items = sorted(items, key=lambda x: x.market_price)
+        items = self.sort_by_price(items)
         self.use_item(items[0])
         return True
 
@@ -146,29 +146,31 @@ class PetTrainingUI(BasePageUI):
 
     def scan_pets(self, pets: list[Neopet], academy: str) -> list[Neopet]:
         self.current_pets = []
-        rows = self.page.locator('.content >> table > tbody > tr > td')
-        rows = rows.all()
+        rows = self.device.extract('.content >> table > tbody > tr > td', {
+            'text': ('', 'text'),
+            'infos': ('b', 'text', True),
+        }, locators=False)
         i = -1
         msg = 'Current pet info:\n'
         while i < len(rows)-1:
             i += 1
-            pet_name = next((p.name for p in pets if p.name in rows[i].text_content()), None)
+            pet_name = next((p.name for p in pets if p.name in rows[i]['text']), None)
             if not pet_name or any(p.name == pet_name for p in self.current_pets):
                 continue
-            infos = rows[i+1].locator('b').all()
+            infos = rows[i+1]['infos'] if i+1 < len(rows) else []
             if len(infos) < 5:
                 logger.warning(f"Parse pet info failed for {pet_name} in {academy} academy")
                 continue
             p = Neopet(
                 name=pet_name,
-                level=str2int(infos[0].text_content()),
-                strength=str2int(infos[1].text_content()),
-                defense=str2int(infos[2].text_content()),
-                movement=str2int(infos[3].text_content()),
-                max_health=str2int(infos[4].text_content().split('/')[-1]),
+                level=str2int(infos[0]),
+                strength=str2int(infos[1]),
+                defense=str2int(infos[2]),
+                movement=str2int(infos[3]),
+                max_health=str2int(infos[4].split('/')[-1]),
                 training=False,
             )
-            if 'currently studying' in rows[i].text_content():
+            if 'currently studying' in rows[i]['text']:
                 p.training = True
             self.current_pets.append(p)
             msg += f"{p.name} (Lv={p.level}, Str={p.strength}, Def={p.defense}, Mov={p.movement}, Hp={p.max_health})\n"
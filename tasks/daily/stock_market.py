@@ -36,9 +36,17 @@ class StockMarketUI(BasePageUI):
         if flag_sold:
             self.device.click('input[value="Sell Shares"]')
 
-    def process_buys(self):
+    def get_tickers(self) -> list[str]:
+        doc = self.device.fetch('https://www.neopets.com/stockmarket.phtml?type=buy')
+        if doc is not None:
+            tickers = [a.text_content() for a in doc.xpath('//center/div/marquee//a')]
+            if tickers:
+                return tickers
         self.goto('https://www.neopets.com/stockmarket.phtml?type=buy')
-        bar = self.page.locator('center > div > marquee')
+        return [str(a.text_content()) for a in self.page.locator('center > div > marquee').locator('a').all()]
+
+    def process_buys(self):
+        tickers = self.get_tickers()
         candidates_bull = {}
         candidates_bear = {}
         price_range = range(15, 16) # only buy 15
@@ -46,8 +54,8 @@ class StockMarketUI(BasePageUI):
             candidates_bull[p] = set()
             candidates_bear[p] = set()
         msg = "Market status:\n"
-        for cc in bar.locator('a').all():
-            code,price,delta = str(cc.text_content()).split()
+        for cc in tickers:
+            code,price,delta = cc.split()
             price = str2int(price)
             delta = str2int(delta)
             msg  += f"{code} {price} {'+' if delta >= 0 else ''}{delta}\n"
@@ -88,6 +96,7 @@ class StockMarketUI(BasePageUI):
             return False
         inv_table[list(inv_table.keys())[0]] += quota
         logger.info(f'Buying shares: {inv_table}')
+        self.goto('https://www.neopets.com/stockmarket.phtml?type=buy')
         for code, buys in inv_table.items():
             inps = self.page.locator('input[type=text]')
             inps.nth(1).fill(code)
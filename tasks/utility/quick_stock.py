@@ -5,6 +5,7 @@ from module.db.models.neoitem import NeoItem
 from module.base.utils import str2int
 from module.config.utils import get_server_next_update
 import module.jelly_neo as jn
+from module.db import data_manager as dm
 
 class QuickStockUI(BasePageUI):
     items: list[NeoItem]
@@ -36,22 +37,21 @@ class QuickStockUI(BasePageUI):
             logger.info("Waiting for items to load...")
             self.device.wait(3)
         # nodes = self.page.locator('form > table > tbody > tr')
-        nodes = self.page.locator('.np-table-row')
-        for node in nodes.all()[:-1]:
-            available_acts = node.locator('input')
-            if not available_acts.count():
+        rows = self.device.extract('.np-table-row', {
+            'acts': ('input', 'count'),
+            'name': 'td',
+            'count': 'td .qs-count-badge',
+        })
+        for row in rows[:-1]:
+            if not row['acts']:
                 continue
-            name_cell = node.locator('td').first
-            item_name = name_cell.text_content().split('×')[0].strip()
+            item_name = (row['name'] or '').split('×')[0].strip()
             if item_name.lower() == 'check all':
                 break
-            count_badge = name_cell.locator('.qs-count-badge')
-            quantity = (str2int(count_badge.text_content()) or 1) if count_badge.count() else 1
-            item = NeoItem(name=item_name, _locator=node, quantity=quantity, _act='deposit')
+            quantity = (str2int(row['count']) or 1) if row['count'] is not None else 1
+            item = NeoItem(name=item_name, _locator=row['_locator'], quantity=quantity, _act='deposit')
             self.items.append(item)
-        jn.batch_search(set(item.name for item in self.items))
-        for item in self.items:
-            item.update_jn()
+        NeoItem.batch_update_jn(self.items)
 
     def get_keep_dict(self):
         lines = self.config.QuickStock_CategoryKeeps.split('\n')
@@ -74,8 +74,12 @@ class QuickStockUI(BasePageUI):
         donate_list = [l.strip() for l in (self.config.QuickStock_DonateNameList or '').split('\n') if l.strip()]
         deposit_list = [l.strip().lower() for l in (self.config.QuickStock_ForceDepositList or '').split('\n') if l.strip()]
         no_stock = self._kwargs.get('no_stock', False)
-        for item in self.items:
-            item.profit = (item.market_price or 0) - (item.restock_price or 0)
+        profits = dm.price_snapshot().profit(
+            [item.name for item in self.items],
+            restock_price=[item.restock_price or 0 for item in self.items],
+        )
+        for item, profit in zip(self.items, profits.tolist()):
+            item.profit = profit
             if (
                 any(re.search(regex, item.name, re.I) for regex in deposit_list)
                 or item.profit >= self.config.QuickStock_DepositValue
@@ -187,14 +191,14 @@ class QuickStockUI(BasePageUI):
             has_next = self.page.locator('a.mkt-pagination-next').count() > 0
             goods = rows.all()
             item_names = [g.locator('.market-your-item__name').text_content().strip() for g in goods]
-            jn.batch_search(set(item_names))
+            found = jn.batch_search_map(item_names)
             changed = False
             for good in goods:
                 name = good.locator('.market-your-item__name').text_content().strip()
                 item = NeoItem(name=name)
-                item.update_jn()
+                item.update_jn(data=found.get(name))
                 item.quantity = str2int(good.locator('.market-your-item__stock-mobile').text_content())
-                item_data = jn.get_item_details_by_name(name)
+                item_data = found.get(name) or jn.get_item_details_by_name(name)
                 price = self.evaluate_price_strategy(item_data)
                 item.stocked_price = price
                 stocked_data.append(item)
@@ -293,22 +297,23 @@ class QuickStockUI(BasePageUI):
         cur_index = 1
         while True:
             wait_for_load()
-            for item in self.page.locator('.closet-grid-item').all():
-                name = item.locator('.closet-item-name').text_content().strip()
-                num  = str2int(item.locator('.closet-grid-item-qty').text_content())
+            rows = self.device.extract('.closet-grid-item', {
+                'name': '.closet-item-name',
+                'quantity': '.closet-grid-item-qty',
+                'image': ('img', 'src'),
+            }, locators=False)
+            for row in rows:
                 items.append(NeoItem(
-                    name=name,
-                    quantity=num,
-                    image=item.locator('img').get_attribute('src'),
+                    name=row['name'] or '',
+                    quantity=str2int(row['quantity'] or ''),
+                    image=row['image'],
                 ))
             next_btn = self.page.locator('.closet-pagination-btn')
             if cur_index+2 >= next_btn.count():
                 break
             cur_index += 1
             self.device.click(next_btn.nth(cur_index))
-        jn.batch_search(set(item.name for item in items))
-        for item in items:
-            item.update_jn()
+        NeoItem.batch_update_jn(items)
         logger.info(f"Found {len(items)} items in closet")
         self.closet = items
         self.config.stored.ClosetData.set(items)
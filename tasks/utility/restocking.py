@@ -2,13 +2,14 @@ from module.logger import logger
 from module.base.utils import str2int
 from module.db.models.neoitem import NeoItem
 from module.db.data_map import SHOP_NAME
+from module.db import data_manager as dm
 from module.base.utils import str2int
 from module.exception import ScriptError
 from tasks.base.base_page import BasePageUI
+from module.device.device import xpath_class
 from playwright._impl._errors import Error as PlaywrightError
 from playwright._impl._errors import TimeoutError
 from copy import copy
-import module.jelly_neo as jn
 from module import captcha
 import re
 import os
@@ -30,8 +31,8 @@ class RestockingUI(BasePageUI):
             logger.info("Delaying restocking due to upcoming auction task")
             return False
         self.check_inventory()
+        # Also updates NP
         self.check_stock()
-        self.update_np()
         if not self.has_enough_np():
             logger.warning("No enough NP to restock, skip restocking")
             return True
@@ -69,8 +70,17 @@ class RestockingUI(BasePageUI):
         return True
 
     def check_inventory(self):
-        self.goto('https://www.neopets.com/inventory.phtml')
         self.inventory_free = 0
+        doc = self.device.fetch('https://www.neopets.com/inventory.phtml')
+        if doc is not None:
+            for count in doc.xpath(f'//*[{xpath_class("inv-total-count")}]'):
+                r = re.search(r"(\d+) / (\d+)", count.text_content())
+                if r:
+                    cur, total = r.groups()
+                    self.inventory_free = int(total) - int(cur)
+                    return
+        # Count is rendered by scripts in some layouts, read it from the browser
+        self.goto('https://www.neopets.com/inventory.phtml')
         for _ in range(10):
             count = self.page.locator('.inv-total-count')
             if count.count():
@@ -99,16 +109,25 @@ class RestockingUI(BasePageUI):
         logger.warning("Failed to parse inventory count, assuming no free slots")
 
     def check_stock(self):
-        self.goto("https://www.neopets.com/market.phtml?type=your")
-        stats = self.page.locator('.market-your-headerbar__stats b')
-        if stats.count() >= 2:
-            used, free = str2int(stats.nth(0).text_content()), str2int(stats.nth(1).text_content())
-        else:
-            stock_text = self.page.locator('center').first.text_content().split(':')
-            if len(stock_text) >= 3:
-                used, free = str2int(stock_text[-2]), str2int(stock_text[-1])
+        used, free = None, None
+        doc = self.device.fetch("https://www.neopets.com/market.phtml?type=your")
+        if doc is not None:
+            stats = doc.xpath(f'//*[{xpath_class("market-your-headerbar__stats")}]//b')
+            if len(stats) >= 2:
+                used, free = str2int(stats[0].text_content()), str2int(stats[1].text_content())
+            self.update_np(doc)
+        if used is None or free is None:
+            self.goto("https://www.neopets.com/market.phtml?type=your")
+            self.update_np()
+            stats = self.page.locator('.market-your-headerbar__stats b')
+            if stats.count() >= 2:
+                used, free = str2int(stats.nth(0).text_content()), str2int(stats.nth(1).text_content())
             else:
-                used, free = None, None
+                stock_text = self.page.locator('center').first.text_content().split(':')
+                if len(stock_text) >= 3:
+                    used, free = str2int(stock_text[-2]), str2int(stock_text[-1])
+                else:
+                    used, free = None, None
         if used is None or free is None:
             logger.warning("Failed to parse stock capacity")
             self.stock_free = 0
@@ -174,18 +193,13 @@ class RestockingUI(BasePageUI):
                 else:
                     logger.info(f"Item {t.name} profit {t.profit} is less than minimum profit {self.config.Restocking_MinProfit}, skipping")
                     continue
-            flag = False
-            for stocked in self.config.stored.StockData:
-                if stocked.name == t.name and stocked.quantity >= self.config.Restocking_MaxShopStock:
-                    logger.info(f"Item {t.name} already fully stocked in your shop, skipping")
-                    flag = True
-                    continue
-            for item in self.config.stored.DepositData:
-                if item.name == t.name and item.quantity >= self.config.Restocking_MaxInSdb:
-                    logger.info(f"Item {t.name} already has {item.quantity} in SDB, skipping")
-                    flag = True
-                    continue
-            if flag:
+            stock, sdb = self.config.stored.StockData, self.config.stored.DepositData
+            if any(i.quantity >= self.config.Restocking_MaxShopStock for i in stock.entries(t.name)):
+                logger.info(f"Item {t.name} already fully stocked in your shop, skipping")
+                continue
+            deposited = [i for i in sdb.entries(t.name) if i.quantity >= self.config.Restocking_MaxInSdb]
+            if deposited:
+                logger.info(f"Item {t.name} already has {deposited[0].quantity} in SDB, skipping")
                 continue
             self.target = t
             break
@@ -224,35 +238,34 @@ class RestockingUI(BasePageUI):
 
     def scan_goods(self):
         self.goods = []
-        nodes = self.page.locator(".shop-item")
-        item_names =  set()
-        for i, node in enumerate(nodes.all()):
-            stock, price = node.locator('.item-stock').all()
+        rows = self.device.extract('.shop-item', {
+            'name': '.item-name',
+            'stock': ('.item-stock', 'text', True),
+            'text': ('', 'text'),
+        })
+        for row in rows:
+            stock, price = row['stock']
             item = NeoItem(
-                index=i,
-                name=node.locator('.item-name').text_content(),
-                quantity=str2int(stock.text_content().split()[0]),
-                restock_price=str2int(price.text_content().split()[1]),
-                _locator=node,
+                index=row['_index'],
+                name=row['name'],
+                quantity=str2int(stock.split()[0]),
+                restock_price=str2int(row['text'].split(':')[-1]),
+                _locator=row['_locator'],
             )
-            item.restock_price = str2int(node.text_content().split(':')[-1])
             self.goods.append(item)
-            item_names.add(item.name)
-        jn.batch_search(item_names)
-        for item in self.goods:
-            item.update_jn()
+        NeoItem.batch_update_jn(self.goods)
 
     def get_profitable_goods(self) -> list[NeoItem]:
+        profits, order = dm.price_snapshot().rank_profit(
+            [good.name for good in self.goods],
+            restock_price=[good.restock_price or 0 for good in self.goods],
+        )
         ret = []
-        for good in self.goods:
-            try:
-                profit = good.market_price - good.restock_price
-            except Exception:
-                profit = 0
-            if profit > 0:
-                good.profit = profit
-                ret.append(good)
-        return sorted(ret, key=lambda x: x.profit, reverse=True)
+        for i in order:
+            good = self.goods[i]
+            good.profit = int(profits[i])
+            ret.append(good)
+        return ret
 
     def haggle(self, offers=None, purposes=None, depth=0):
         self.device.run_default_scripts()
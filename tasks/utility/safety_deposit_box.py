@@ -2,7 +2,6 @@ from module.logger import logger
 from tasks.base.base_page import BasePageUI
 from module.db.models.neoitem import NeoItem
 from module.base.utils import str2int, lcs_multi
-import module.jelly_neo as jn
 
 class SafetyDepositBoxUI(BasePageUI):
     items: list[NeoItem]
@@ -36,28 +35,23 @@ class SafetyDepositBoxUI(BasePageUI):
             else:
                 break
 
-        item_names = [i.name for i in self.items]
-        jn.batch_search(item_names)
-        for item in self.items:
-            item.update_jn()
+        NeoItem.batch_update_jn(self.items)
         self.config.stored.DepositData.set(self.items)
         return self.items
 
     def scan_page_items(self, include_data:bool=False) -> list[NeoItem]:
-        rows = self.page.locator('tr:has(.sdb-item-name)')
-        data = rows.evaluate_all("""rows => rows.map((row, index) => ({
-            index,
-            name: row.querySelector('.sdb-item-name')?.textContent?.trim() || '',
-            quantity: row.querySelector('.sdb-qty-cell')?.textContent?.trim() || '',
-            image: row.querySelector('.sdb-item-img')?.src || '',
-        })).filter(item => item.name)""")
+        data = self.device.extract('tr:has(.sdb-item-name)', {
+            'name': '.sdb-item-name',
+            'quantity': '.sdb-qty-cell',
+            'image': ('.sdb-item-img', '.src'),
+        }, required='name')
         if data:
             ret = [
                 NeoItem(
                     name=item['name'],
-                    quantity=str2int(item['quantity']),
-                    image=item['image'],
-                    _locator=rows.nth(item['index'])
+                    quantity=str2int(item['quantity'] or ''),
+                    image=item['image'] or '',
+                    _locator=item['_locator']
                 )
                 for item in data
             ]
@@ -87,10 +81,7 @@ class SafetyDepositBoxUI(BasePageUI):
                     _locator=cells
                 ))
         if include_data:
-            item_names = [i.name for i in ret]
-            jn.batch_search(item_names)
-            for item in ret:
-                item.update_jn()
+            NeoItem.batch_update_jn(ret)
         return ret
 
     def _confirm_action(self) -> bool:
@@ -255,7 +255,7 @@ class ShopWizardUI(BasePageUI):
             if item.get('market_price', 0) >= self.MAX_MARKET_PRICE:
                 logger.info(f"Skipping {i.name} price update due to too expensive to search")
                 continue
-            if item.get("price_timestamp", 0) > now_ts - dm.JN_CACHE_TTL/2:
+            if item.get("price_timestamp", 0) > now_ts - dm.item_ttl(item)/2:
                 continue
             ret.append((i.name, 'price_update', 0))
             added_names.add(i.name)
@@ -265,12 +265,12 @@ class ShopWizardUI(BasePageUI):
             return ret
         # update expiring items in jn cache
         jn.load_cache()
-        cache = sorted(dm.ItemDatabase.values(), key=lambda x: x.get('price_timestamp', 0))
+        cache = sorted(dm.ItemDatabase.values(), key=lambda x: x.get('price_timestamp', 0) + dm.item_ttl(x)/2)
         for item in cache:
             if item.get('market_price', 0) >= self.MAX_MARKET_PRICE:
                 logger.info(f"Skipping {item['name']} price update due to too expensive to search")
                 continue
-            if item.get("price_timestamp", 0) > now_ts - dm.JN_CACHE_TTL/2:
+            if item.get("price_timestamp", 0) > now_ts - dm.item_ttl(item)/2:
                 break
             if item["name"] in added_names:
                 continue
@@ -0,0 +1,165 @@
+import os
+import random
+import shutil
+
+import pytest
+
+config = pytest.importorskip('module.config.config')
+utils = pytest.importorskip('module.config.utils')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NAME = 'test'
+PATH = 'PetCares.Scheduler.IsRunningBackground'
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    # Files are linked one by one, so lock files of `file_lock()` are created in tmp_path
+    argument = tmp_path / 'module' / 'config' / 'argument'
+    argument.mkdir(parents=True)
+    for file in os.listdir(os.path.join(ROOT, 'module', 'config', 'argument')):
+        os.symlink(os.path.join(ROOT, 'module', 'config', 'argument', file), argument / file)
+    os.symlink(os.path.join(ROOT, 'module', 'config', 'i18n'), tmp_path / 'module' / 'config' / 'i18n')
+    (tmp_path / 'config').mkdir()
+    shutil.copy(os.path.join(ROOT, 'config', 'template.json'), tmp_path / 'config' / f'{NAME}.json')
+    monkeypatch.chdir(tmp_path)
+    return utils.filepath_config(NAME)
+
+
+def read(path):
+    return utils.deep_get(utils.read_file(utils.filepath_config(NAME)), keys=path)
+
+
+def test_transaction_commits(config_file):
+    main = config.AzurLaneConfig(NAME)
+    with main.transaction(expected={PATH: False}) as tx:
+        main.cross_set(PATH, True)
+    assert tx.committed
+    assert read(PATH) is True
+
+
+def test_transaction_conflict(config_file):
+    main = config.AzurLaneConfig(NAME)
+    other = config.AzurLaneConfig(NAME)
+    with main.transaction(expected={PATH: False}) as tx:
+        main.cross_set(PATH, True)
+        # Another process claims it first
+        other.cross_set(PATH, True)
+        other.cross_set('PetCares.Scheduler.Enable', False)
+    assert not tx.committed
+    assert not main.modified
+    # Changes of the other process are kept, nothing of the transaction is written
+    assert read('PetCares.Scheduler.Enable') is False
+    assert main.cross_get('PetCares.Scheduler.Enable') is False
+
+
+def test_journal_replayed_by_scheduler_only(config_file):
+    with open(utils.filepath_journal(NAME), 'wb') as f:
+        f.write(b'{"PetCares.Scheduler.EnableBackground": true}\n{"torn')
+    viewer = config.AzurLaneConfig(NAME)
+    assert not viewer.modified
+    assert read('PetCares.Scheduler.EnableBackground') is False
+    assert os.path.exists(utils.filepath_journal(NAME))
+
+    config.AzurLaneConfig(NAME, replay_journal=True)
+    assert read('PetCares.Scheduler.EnableBackground') is True
+    assert not os.path.exists(utils.filepath_journal(NAME))
+    viewer.load()
+    assert viewer.cross_get('PetCares.Scheduler.EnableBackground') is True
+
+
+def test_dropped_configs_unsubscribe(config_file):
+    import gc
+    import weakref
+    from module.config.watcher import Watcher
+
+    gc.collect()
+    count = len(Watcher.subscribers)
+    refs = []
+    for _ in range(5):
+        main = config.AzurLaneConfig(NAME)
+        main.start_watching()
+        refs.append(weakref.ref(main))
+        del main
+    gc.collect()
+    assert len(Watcher.subscribers) == count
+    assert all(ref() is None for ref in refs)
+
+    main = config.AzurLaneConfig(NAME)
+    main.start_watching()
+    assert len(Watcher.subscribers) == count + 1
+    main.stop_watching()
+    assert len(Watcher.subscribers) == count
+
+
+def deposit_names(main):
+    return [item.name for item in main.stored.DepositData]
+
+
+@pytest.fixture
+def neoitem():
+    return pytest.importorskip('module.db.models.neoitem').NeoItem
+
+
+def test_journal_deltas(config_file, neoitem):
+    main = config.AzurLaneConfig(NAME)
+    main.STORED_FLUSH_INTERVAL = 3600
+    journal = utils.filepath_journal(NAME)
+    rng = random.Random(0)
+    main.stored.DepositData.set([
+        neoitem(name=f'Item {i}', quantity=1, description=rng.randbytes(16).hex())
+        for i in range(1000)
+    ])
+    size = os.path.getsize(journal)
+    for i in range(50):
+        main.stored.DepositData.add(neoitem(name=f'New {i}', quantity=1))
+    main.stored.DepositData.remove('Item 3')
+    # Only the changes are journaled, not the whole container each time
+    assert os.path.getsize(journal) - size < 5 * size
+    assert read('SafetyDepositBox.SafetyDepositBox.DepositData') != main.modified[
+        'SafetyDepositBox.SafetyDepositBox.DepositData']
+
+    # Exited without flushing
+    config.AzurLaneConfig(NAME, replay_journal=True)
+    assert not os.path.exists(journal)
+    names = deposit_names(config.AzurLaneConfig(NAME))
+    assert names == deposit_names(main)
+    assert len(names) == 1049
+    assert 'Item 3' not in names
+
+
+def test_journal_in_batch(config_file, neoitem):
+    main = config.AzurLaneConfig(NAME)
+    with main.multi_set():
+        main.stored.DepositData.add(neoitem(name='Apple', quantity=1))
+        assert os.path.exists(utils.filepath_journal(NAME))
+    assert not os.path.exists(utils.filepath_journal(NAME))
+    assert deposit_names(config.AzurLaneConfig(NAME)) == ['Apple']
+
+
+def test_transaction_conflict_keeps_stored(config_file, neoitem):
+    main = config.AzurLaneConfig(NAME)
+    other = config.AzurLaneConfig(NAME)
+    with main.transaction(expected={PATH: False}) as tx:
+        main.cross_set(PATH, True)
+        main.stored.DepositData.add(neoitem(name='Apple', quantity=1))
+        other.cross_set(PATH, True)
+    assert not tx.committed
+    assert list(main.modified) == ['SafetyDepositBox.SafetyDepositBox.DepositData']
+    main.flush_stored()
+    assert deposit_names(config.AzurLaneConfig(NAME)) == ['Apple']
+
+
+def test_task_queue_shared(config_file):
+    main = config.AzurLaneConfig(NAME)
+    main.get_next_task()
+    queue = main.task_queue
+    main.task_delay(task='PetCares', minute=60)
+    del main
+
+    # The scheduler builds a new config after every task
+    main = config.AzurLaneConfig(NAME)
+    assert main.task_queue is queue
+    main.get_next_task()
+    assert 'PetCares' not in [func.command for func in main.pending_task]
+    assert main.task_queue is queue
@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+dm = pytest.importorskip('module.db.data_manager')
+item_container = pytest.importorskip('module.db.models.item_container')
+
+
+def model(key, value):
+    return item_container.ItemContainer(id=key, value=value)
+
+
+def values(manager):
+    return {key: manager.data[key].value for key in manager.data}
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = dm.DataManager('test', 'local', save_path=str(tmp_path / 'models.dat'))
+    manager.data = {f'k{i}': model(f'k{i}', i) for i in range(20)}
+    manager.save()
+    yield manager
+    manager._close_local()
+
+
+def reload(manager, lazy=False):
+    loaded = dm.DataManager('test', 'local', save_path=manager.save_path)
+    loaded.load_local(lazy=lazy)
+    return loaded
+
+
+def test_round_trip(manager):
+    loaded = reload(manager)
+    assert values(loaded) == {f'k{i}': i for i in range(20)}
+    loaded._close_local()
+
+
+def test_incremental_save(manager):
+    manager = reload(manager, lazy=True)
+    assert not manager.data.loaded
+    manager.data['k3'] = model('k3', 300)
+    manager.data['new'] = model('new', -1)
+    del manager.data['k5']
+    size = os.path.getsize(manager.save_path)
+    manager.save_local(keys=['k3', 'new'])
+    # Appended, not rewritten
+    assert os.path.getsize(manager.save_path) > size
+    assert manager._dead > 0
+
+    loaded = reload(manager)
+    expected = {f'k{i}': i for i in range(20) if i != 5}
+    expected.update(k3=300, new=-1)
+    assert values(loaded) == expected
+    assert values(manager) == expected
+    manager._close_local()
+    loaded._close_local()
+
+
+def test_rewrite_drops_dead_bytes(manager):
+    size = os.path.getsize(manager.save_path)
+    for n in range(100):
+        manager.data['k0'] = model('k0', n)
+        manager.save_local(keys=['k0'])
+        # Rewritten once superseded records outgrow the live ones
+        assert os.path.getsize(manager.save_path) < 3 * size
+    loaded = reload(manager)
+    assert loaded.data['k0'].value == 99
+    assert len(loaded.data) == 20
+    loaded._close_local()
+
+
+def test_global_ttl(tmp_path, monkeypatch):
+    monkeypatch.setattr(dm, 'RedisConn', None)
+    monkeypatch.setattr(dm, '_GLOBAL_FILE', tmp_path / 'globals.json')
+    now = 1000.0
+    monkeypatch.setattr(dm, 'time', lambda: now)
+    dm.global_set('proof:a', 'a', ttl=10)
+    dm.global_set('proof:b', 'b', ttl=100)
+    dm.global_set('other', 'c')
+    assert dm.global_items('proof:') == {'proof:a': 'a', 'proof:b': 'b'}
+
+    now = 1050.0
+    assert dm.global_get('proof:a') is None
+    assert dm.global_items() == {'proof:b': 'b', 'other': 'c'}
+    # expired keys are dropped on the next write
+    dm.global_set('proof:b', 'b')
+    assert '"proof:a"' not in (tmp_path / 'globals.json').read_text()
+
+    now = 2000.0
+    assert dm.global_get('proof:b') == 'b'
+    dm.global_delete('proof:b')
+    assert dm.global_items() == {'other': 'c'}
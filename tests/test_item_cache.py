@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+
+dm = pytest.importorskip('module.db.data_manager')
+
+
+def item(i, price=100):
+    return {'name': f'Item {i}', 'market_price': price + i}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(dm, 'RedisConn', None)
+    monkeypatch.setattr(dm, '_CompactRetrySize', 0)
+    dm.clear_cache()
+    yield dm
+    dm.clear_cache()
+
+
+def test_compaction_round_trip(cache):
+    cache.save_many([item(i) for i in range(50)])
+    cache.save_many([item(3, price=500), {'name': 'Broken', 'market_price': 0}])
+    cache.compact_item_cache()
+    cache.ItemDatabase = {}
+    db = cache.load_item_cache(force_local=True)
+    assert isinstance(db, cache.ItemTable)
+    assert not db.delta
+    assert db['item 3']['market_price'] == 503
+    assert db['item 49']['market_price'] == 149
+    assert 'broken' not in db
+
+
+def test_read_during_compaction(cache):
+    cache.save_many([item(i) for i in range(300)])
+    cache.compact_item_cache()
+    cache.load_item_cache(force_local=True)
+    names = [f'Item {i}' for i in range(0, 300, 3)]
+    errors = []
+    done = threading.Event()
+
+    def reader():
+        while not done.is_set():
+            try:
+                found = cache.get_many(names)
+                assert len(found) == len(names)
+                assert cache.ItemDatabase.get('item 7')['name'] == 'Item 7'
+            except Exception as e:
+                errors.append(e)
+                return
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for n in range(30):
+        cache.save_many([item(n, price=n)])
+        cache.compact_item_cache()
+    done.set()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert cache.get_many(['Item 29'])['item 29']['market_price'] == 58
+
+
+def test_failed_compaction_backs_off(cache, monkeypatch):
+    calls = []
+
+    def build(path, data):
+        calls.append(len(data))
+        raise PermissionError('index is mapped')
+
+    monkeypatch.setattr(cache, 'CACHE_LOG_COMPACT_SIZE', 0)
+    monkeypatch.setattr(cache.MappedItemStore, 'build', staticmethod(build))
+    cache.save_many([item(0)])
+    assert len(calls) == 1
+    for i in range(1, 10):
+        cache.save_many([item(i)])
+    # Retried only each time the log has doubled, not on every append
+    assert calls == [1, 3, 7]
+    assert cache.get_many(['Item 9'])['item 9']['market_price'] == 109
+
+
+def test_log_replayed_over_snapshot(cache):
+    cache.save_many([item(i) for i in range(10)])
+    cache.compact_item_cache()
+    cache.save_many([item(1, price=900), item(10)])
+    with open(cache.CACHE_LOG_FILE, 'ab') as fh:
+        # torn write of a crashed process, then a line still being written
+        fh.write(b'{"name": "Torn\n{"name": "Item 11", "market_')
+    items, offset = cache._read_cache_log()
+    assert sorted(items) == ['item 1', 'item 10']
+    with open(cache.CACHE_LOG_FILE, 'rb') as fh:
+        assert fh.read()[offset:] == b'{"name": "Item 11", "market_'
+
+    cache.ItemDatabase = {}
+    db = cache.load_item_cache(force_local=True)
+    assert sorted(db.delta) == ['item 1', 'item 10']
+    assert db['item 1']['market_price'] == 901
+    assert db['item 2']['market_price'] == 102
+    assert len(db) == 11
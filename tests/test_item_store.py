@@ -0,0 +1,68 @@
+import threading
+
+from module.db.item_store import ItemTable, MappedItemStore
+
+
+def make_items(count, price=1):
+    return {f'item {i}': {'name': f'Item {i}', 'market_price': price + i} for i in range(count)}
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / 'items.idx'
+    data = make_items(100)
+    MappedItemStore.build(path, data)
+    store = MappedItemStore(path)
+    assert len(store) == 100
+    assert dict(store.items()) == data
+    assert 'item 42' in store
+    assert 'item 100' not in store
+    assert store.get('item 100') is None
+
+
+def test_missing_file(tmp_path):
+    store = MappedItemStore(tmp_path / 'items.idx')
+    assert len(store) == 0
+    assert 'item 0' not in store
+    assert list(store) == []
+
+
+def test_table_delta_overrides_base(tmp_path):
+    path = tmp_path / 'items.idx'
+    MappedItemStore.build(path, make_items(3))
+    table = ItemTable(MappedItemStore(path))
+    table['item 1'] = {'name': 'Item 1', 'market_price': 99}
+    table['item 5'] = {'name': 'Item 5', 'market_price': 5}
+    del table['item 2']
+    assert table['item 1']['market_price'] == 99
+    assert 'item 2' not in table
+    assert sorted(table) == ['item 0', 'item 1', 'item 5']
+
+
+def test_read_while_base_swapped(tmp_path):
+    path = tmp_path / 'items.idx'
+    data = make_items(500)
+    MappedItemStore.build(path, data)
+    table = ItemTable(MappedItemStore(path))
+    errors = []
+    done = threading.Event()
+
+    def reader():
+        while not done.is_set():
+            try:
+                for i in range(0, 500, 7):
+                    assert table.get(f'item {i}')['name'] == f'Item {i}'
+            except Exception as e:
+                errors.append(e)
+                return
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for n in range(30):
+        MappedItemStore.build(path, make_items(500, price=n))
+        table.base = MappedItemStore(path)
+    done.set()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert table['item 3']['market_price'] == 29 + 3
@@ -0,0 +1,54 @@
+import copy
+import sys
+
+import pytest
+
+neoitem = pytest.importorskip('module.db.models.neoitem')
+item_container = pytest.importorskip('module.db.models.item_container')
+
+
+def item(**kwargs):
+    return neoitem.NeoItem(name='Cheese', quantity=3, effects=['yum'], **kwargs)
+
+
+def test_no_instance_dict():
+    locator = object()
+    model = item(_locator=locator)
+    assert not hasattr(model, '__dict__')
+    assert not hasattr(model, '__weakref__')
+    assert model.locator is locator
+    # the locator lives in a slot, no dict is allocated for it
+    assert getattr(model, '_extra', None) is None
+
+    plain = item_container.ItemContainer(**model.to_dict())
+    assert sys.getsizeof(model) < sys.getsizeof(plain) + sys.getsizeof(plain.__dict__)
+
+
+def test_extra_attributes():
+    model = item()
+    model.profit = 10
+    model._act = 'buy'
+    assert model.profit == 10
+    assert model._act == 'buy'
+    assert model.to_dict()['profit'] == 10
+    assert '_act' not in model.to_dict()
+    with pytest.raises(AttributeError):
+        model.missing
+
+
+@pytest.mark.parametrize('copier', [copy.copy, copy.deepcopy])
+def test_copy_round_trip(copier):
+    locator = object()
+    model = item(_locator=locator)
+    model.profit = 10
+    model._act = 'buy'
+    other = copier(model)
+    assert other is not model
+    assert other.to_dict() == model.to_dict()
+    assert other.locator is locator
+    assert other._act == 'buy'
+    other.profit = 20
+    assert model.profit == 10
+    if copier is copy.deepcopy:
+        other.effects.append('meh')
+        assert model.effects == ['yum']
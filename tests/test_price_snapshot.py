@@ -0,0 +1,48 @@
+import threading
+
+from module.db.price_snapshot import PriceSnapshot
+
+
+def item(i, market=100, restock=50):
+    return {'name': f'Item {i}', 'id': i, 'market_price': market + i, 'restock_price': restock}
+
+
+def test_update_and_rank():
+    snapshot = PriceSnapshot([item(i) for i in range(5)])
+    snapshot.update([item(2, market=1000), item(9), {'name': 'Broken', 'market_price': 'n/a'}])
+    assert len(snapshot) == 7
+    assert 'item 9' in snapshot
+    names = ['Item 0', 'Item 2', 'Missing', 'Broken', 'Item 9']
+    assert snapshot.column('market_price', names).tolist() == [100, 1002, 0, 0, 109]
+    profit, order = snapshot.rank_profit(names, min_profit=1)
+    assert profit.tolist() == [50, 952, 0, -0, 59]
+    assert order.tolist() == [1, 4, 0]
+    assert snapshot.argsort(names, descending=True).tolist() == [1, 4, 0, 2, 3]
+
+
+def test_read_while_updated():
+    snapshot = PriceSnapshot([item(0)])
+    names = [f'Item {i}' for i in range(0, 2000, 7)]
+    errors = []
+    done = threading.Event()
+
+    def reader():
+        while not done.is_set():
+            try:
+                profit, order = snapshot.rank_profit(names)
+                assert len(profit) == len(names)
+                snapshot.argsort(names)
+            except Exception as e:
+                errors.append(e)
+                return
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for i in range(1, 2000, 3):
+        snapshot.update([item(i), item(i + 1), item(0, market=i)])
+    done.set()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(snapshot) == 1335
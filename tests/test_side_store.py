@@ -0,0 +1,31 @@
+import pytest
+
+side_store = pytest.importorskip('module.config.stored.side_store')
+neoitem = pytest.importorskip('module.db.models.neoitem')
+
+
+@pytest.fixture
+def ref(tmp_path, monkeypatch):
+    monkeypatch.setattr(side_store, 'SIDE_STORE_DIR', str(tmp_path / 'stored'))
+    value = [neoitem.NeoItem(name=f'Item {i}', quantity=i) for i in range(10)]
+    ref = side_store.dump('test', 'Inventory', value)
+    # edits of the dumped list do not reach the cache
+    value[0].quantity = 100
+    value.append(neoitem.NeoItem(name='Extra'))
+    return ref
+
+
+def test_loads_are_independent(ref):
+    first = side_store.load(ref)
+    first[1].quantity = 100
+    first.pop()
+    second = side_store.load(ref)
+    assert second is not first
+    assert [i.quantity for i in second] == list(range(10))
+
+
+def test_loads_from_file(ref):
+    side_store._Loaded.clear()
+    first = side_store.load(ref)
+    first.clear()
+    assert [i.quantity for i in side_store.load(ref)] == list(range(10))
@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+
+import pytest
+
+classes = pytest.importorskip('module.config.stored.classes')
+utils = pytest.importorskip('module.config.utils')
+
+
+@dataclass(eq=False)
+class Item:
+    name: str
+    quantity: int = 1
+    category: str = ''
+
+    def __eq__(self, value):
+        # Same as NeoItem
+        if isinstance(value, Item):
+            return self.name == value.name
+        return self.name == value
+
+
+class Config:
+    def __init__(self):
+        self.data = {}
+
+    def stored_update(self, path, value, delta=None):
+        utils.deep_set(self.data, keys=path, value=value)
+
+
+@pytest.fixture
+def container():
+    stored = classes.StoredItemContainer('Test.Test.Inventory')
+    stored._bind(Config())
+    stored.set([Item('Apple', 2), Item('Pear'), Item('Apple', 5), Item('Coin', 100, 'cash')])
+    return stored
+
+
+def test_index_after_remove(container):
+    assert [i.quantity for i in container.entries('Apple')] == [2, 5]
+    container.remove('Apple')
+    assert 'Apple' not in container
+    assert container.entries('Apple') == []
+    assert [i.name for i in container] == ['Pear', 'Coin']
+    container.add(Item('Apple', 3))
+    assert container.get('Apple').quantity == 3
+    assert len(container) == 3
+
+
+def test_index_after_list_replaced(container):
+    # such as reloading the config
+    container._stored['value'] = [Item('Plum')]
+    assert 'Apple' not in container
+    assert container['Plum'].quantity == 1
+
+
+def test_size(container):
+    assert container.size == 8
+    container.add(Item('Plum', 3), Item('Coin', 5, 'cash'))
+    assert container.size == 11
+    container['Pear'].quantity = 0
+    container['Apple'].quantity -= 1
+    container.remove('Plum')
+    assert container.size == 7
+    container['Apple'].quantity += 1
+    container.set(container.value)
+    assert container.size == 8
+    container._stored['value'] = [Item('Plum', 4)]
+    assert container.size == 4
+    container.set([Item('Apple', 2), Item('Pear')])
+    container.remove('Apple')
+    assert container.size == 1
+    assert not container.is_full()
+    container.capacity = 1
+    assert container.is_full()
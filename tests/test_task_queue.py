@@ -0,0 +1,93 @@
+import operator
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+config = pytest.importorskip('module.config.config')
+Filter = pytest.importorskip('module.base.filter').Filter
+
+PRIORITY = config.AzurLaneConfig.SCHEDULER_PRIORITY
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def sorted_split(data, now):
+    """
+    Scheduling of `get_next_task()` before the task queue, sorting every task on each call.
+    """
+    pending, waiting, error = [], [], []
+    for func in data.values():
+        func = config.Function(func)
+        if not func.enable:
+            continue
+        if not isinstance(func.next_run, datetime):
+            error.append(func)
+        elif func.next_run < now:
+            pending.append(func)
+        else:
+            waiting.append(func)
+    f = Filter(regex=r"(.*)", attr=["command"])
+    f.load(PRIORITY)
+    if pending:
+        pending = f.apply(pending)
+    if waiting:
+        waiting = sorted(f.apply(waiting), key=operator.attrgetter("next_run"))
+    return error + pending, waiting
+
+
+def random_data(rng, commands):
+    data = {}
+    for command in commands:
+        next_run = NOW + timedelta(minutes=rng.randint(-30, 30))
+        data[command] = {'Scheduler': {
+            'Enable': rng.random() < 0.8,
+            'Command': command,
+            'NextRun': next_run if rng.random() < 0.95 else 'invalid',
+        }}
+    return data
+
+
+def names(funcs):
+    return [(func.command, func.next_run) for func in funcs]
+
+
+@pytest.fixture
+def commands():
+    f = Filter(regex=r"(.*)", attr=["command"])
+    f.load(PRIORITY)
+    return [command for command, in f.filter] + ['NotScheduled']
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_same_order_as_sort(commands, seed):
+    rng = random.Random(seed)
+    data = random_data(rng, commands)
+    queue = config.TaskQueue(PRIORITY)
+    for step in range(10):
+        queue.sync(data)
+        # Hoarding moves `now` back and forth
+        now = NOW + timedelta(minutes=rng.randint(-20, 20))
+        pending, waiting = queue.split(now)
+        expected = sorted_split(data, now)
+        assert names(pending) == names(expected[0])
+        assert names(waiting) == names(expected[1])
+        # A new data dict, as a reload of the config file gives
+        data = {key: {'Scheduler': dict(section['Scheduler'])} for key, section in data.items()}
+        for key in rng.sample(list(data), 5):
+            data[key]['Scheduler']['Enable'] = rng.random() < 0.8
+            data[key]['Scheduler']['NextRun'] = NOW + timedelta(minutes=rng.randint(-30, 30))
+
+
+def test_update(commands):
+    data = random_data(random.Random(0), commands)
+    for section in data.values():
+        section['Scheduler'].update(Enable=True, NextRun=NOW + timedelta(hours=1))
+    queue = config.TaskQueue(PRIORITY)
+    queue.sync(data)
+    first, second = commands[:2]
+    queue.update(first, next_run=NOW - timedelta(minutes=1))
+    queue.update(second, enable=False)
+    pending, waiting = queue.split(NOW)
+    assert names(pending) == [(first, NOW - timedelta(minutes=1))]
+    assert second not in [func.command for func in waiting]
+    assert len(waiting) == len(commands) - 3